@@ -0,0 +1,90 @@
+import numpy as np
+
+from Detections import Detections
+
+
+def interpolate_detections(previous, current, alpha):
+    """
+    Detections between two keyframes at fraction alpha (0 = previous, 1 = current).
+    Only tracks present in both keyframes are interpolated; the others appear or vanish at a keyframe.
+    """
+    if previous is None or current is None:
+        return previous
+    previous_boxes = {track_id: (box, cls) for box, cls, track_id
+                      in zip(previous.boxes, previous.class_indices, previous.track_ids) if track_id is not None}
+
+    boxes, class_indices, track_ids = [], [], []
+    for box, cls, track_id in zip(current.boxes, current.class_indices, current.track_ids):
+        if track_id not in previous_boxes:
+            continue
+        previous_box, _ = previous_boxes[track_id]
+        boxes.append(np.asarray(previous_box) + (np.asarray(box) - np.asarray(previous_box)) * alpha)
+        class_indices.append(cls)
+        track_ids.append(track_id)
+
+    return Detections(
+        boxes=np.array(boxes, dtype=np.float32).reshape(-1, 4),
+        class_indices=class_indices,
+        track_ids=track_ids,
+        offset=current.offset,
+        stale=current.stale,
+    )
+
+
+class StrideController:
+    """
+    Picks how many frames to advance before the next detection (the stride k).
+    After every keyframe it looks at the tracks seen in the last two keyframes: with no tracks the
+    stride grows to max_stride, busy scenes lower the cap, and any track that is near the crossing
+    line, or would reach it within safety * k frames at its current speed, pulls k down.
+    """
+
+    def __init__(self, crossing_y, min_stride=1, max_stride=6, near_px=40, safety=2.0, crowd=8):
+        self.crossing_y = crossing_y
+        self.min_stride = max(1, min_stride)
+        self.max_stride = max(self.min_stride, max_stride)
+        self.near_px = near_px
+        self.safety = safety
+        self.crowd = crowd  # Every this many active tracks halve the stride cap
+        self.stride = 1  # Always detect the first frame
+        self.keyframes = 0
+        self.frames = 0
+
+    def _bottoms(self, detections):
+        if detections is None:
+            return {}
+        offset_y = detections.offset[1]
+        return {track_id: float(box[3]) + offset_y
+                for box, track_id in zip(detections.boxes, detections.track_ids) if track_id is not None}
+
+    def update(self, previous, current, frames_between):
+        """
+        Chooses the stride after a keyframe; frames_between is the distance to the previous keyframe.
+        """
+        current_bottoms = self._bottoms(current)
+        if not current_bottoms:
+            self.stride = self.max_stride
+            return self.stride
+
+        previous_bottoms = self._bottoms(previous)
+        stride = max(self.min_stride, self.max_stride >> (len(current_bottoms) // self.crowd))
+        for track_id, bottom in current_bottoms.items():
+            distance = abs(bottom - self.crossing_y)
+            if distance <= self.near_px:
+                stride = self.min_stride
+                break
+            if track_id in previous_bottoms and frames_between > 0:
+                speed = abs(bottom - previous_bottoms[track_id]) / frames_between
+                if speed > 0:
+                    stride = min(stride, int(distance / (speed * self.safety)))
+
+        self.stride = int(min(self.max_stride, max(self.min_stride, stride)))
+        return self.stride
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "keyframes": self.keyframes,
+            "detect_ratio": round(self.keyframes / self.frames, 3) if self.frames else 0.0,
+            "stride": self.stride,
+        }
@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+
+DEFAULT_FPS = 15  # Frame rate the original fixed speed constant assumed, used when the real one is unknown
+DEFAULT_PPM = 8  # Pixels per metre of the original flat-scale estimate, used without a calibration
+# Without a calibration the flat scale only holds near the crossing, so just the newest seconds are fitted
+UNCALIBRATED_WINDOW = 0.5
+
+
+class Calibration:
+    """
+    Ground-plane homography of one camera: maps image pixels to road-plane coordinates in metres.
+    Built from four (or more) points clicked on the road in the image and their positions on
+    the road, typically the corners of a rectangle of known width and length.
+    """
+
+    def __init__(self, image_points, world_points):
+        self.image_points = [tuple(map(float, p)) for p in image_points]
+        self.world_points = [tuple(map(float, p)) for p in world_points]
+        if len(self.image_points) < 4 or len(self.image_points) != len(self.world_points):
+            raise ValueError("A calibration needs at least 4 image points and as many world points")
+        homography, _ = cv2.findHomography(np.array(self.image_points, dtype=np.float64),
+                                           np.array(self.world_points, dtype=np.float64))
+        if homography is None:
+            raise ValueError("Calibration points are degenerate (three of them on one line?)")
+        self.homography = homography
+
+    @classmethod
+    def from_rectangle(cls, image_points, width, length):
+        """
+        image_points are the corners of a road rectangle width metres across and length metres
+        along the road, clicked in order: far-left, far-right, near-right, near-left.
+        """
+        return cls(image_points, [(0, 0), (width, 0), (width, length), (0, length)])
+
+    def to_world(self, points):
+        """
+        Road-plane coordinates in metres of image points shaped (..., 2).
+        """
+        points = np.asarray(points, dtype=np.float64)
+        h = self.homography
+        x, y = points[..., 0], points[..., 1]
+        w = h[2, 0] * x + h[2, 1] * y + h[2, 2]
+        return np.stack([(h[0, 0] * x + h[0, 1] * y + h[0, 2]) / w,
+                         (h[1, 0] * x + h[1, 1] * y + h[1, 2]) / w], axis=-1)
+
+    def to_dict(self):
+        return {"image_points": self.image_points, "world_points": self.world_points}
+
+    @classmethod
+    def from_dict(cls, entry):
+        return cls(entry["image_points"], entry["world_points"])
+
+
+def fit_speeds(points, frames, counts, fps=None, calibration=None):
+    """
+    Speed in km/h of several tracks at once, from a least-squares line fitted to each track's
+    position history against time.
+
+    points: (K, L, 2) image positions, frames: (K, L) frame indices, counts: (K,) number of valid
+    entries at the start of each row (rows are padded to L, newest entry first). Positions are
+    mapped to metres on the road plane through the calibration and the whole history is fitted.
+    Without a calibration the flat DEFAULT_PPM scale is used, which perspective distorts away
+    from the crossing, so only the last UNCALIBRATED_WINDOW seconds (at least two points) are.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if calibration is not None:
+        world = calibration.to_world(points)
+    else:
+        world = points / DEFAULT_PPM
+    t = np.asarray(frames, dtype=np.float64) / (fps or DEFAULT_FPS)
+
+    index = np.arange(points.shape[1])[None, :]
+    valid = index < np.asarray(counts)[:, None]
+    if calibration is None:
+        valid &= (t[:, :1] - t <= UNCALIBRATED_WINDOW) | (index < 2)
+    n = np.maximum(valid.sum(axis=1), 1)
+    t_mean = np.where(valid, t, 0).sum(axis=1) / n
+    dt = np.where(valid, t - t_mean[:, None], 0)
+    world_mean = np.where(valid[..., None], world, 0).sum(axis=1) / n[:, None]
+    dw = np.where(valid[..., None], world - world_mean[:, None, :], 0)
+
+    # Slope of position over time per axis: sum(dt * dw) / sum(dt^2)
+    denominator = (dt ** 2).sum(axis=1)
+    velocity = (dt[..., None] * dw).sum(axis=1) / np.where(denominator > 0, denominator, 1)[:, None]
+    speed = np.hypot(velocity[:, 0], velocity[:, 1]) * 3.6
+    return np.where(denominator > 0, speed, 0.0)
@@ -0,0 +1,70 @@
+from collections import Counter, deque
+
+DIRECTIONS = ("in", "out")
+
+
+class CrossingCounter:
+    """
+    Counting state of one stream, constant time per crossing and bounded in memory:
+
+    - totals[direction][class]: crossings per class, in first-seen order (what the panels show)
+    - lane_counts[(direction, class, lane)]: crossings per lane
+    - events[direction]: the most recent unique events, at most max_events per direction;
+      the full history goes to the analyzer's sinks (event log, event store) as it happens
+    - a hash set per direction for the "already recorded" check, remembering the last
+      dedup_window track IDs (tracker IDs only grow, a re-crossing comes within seconds)
+
+    Like the lists it replaces, totals and lane_counts count every crossing, while an event
+    record is kept (and sent to the sinks) only for the first crossing of a track ID.
+    """
+
+    def __init__(self, max_events=10000, dedup_window=10000):
+        self.max_events = max_events
+        self.dedup_window = dedup_window
+        self.totals = {direction: {} for direction in DIRECTIONS}
+        self.lane_counts = Counter()
+        self.events = {direction: deque(maxlen=max_events) for direction in DIRECTIONS}
+        self.seen = {direction: set() for direction in DIRECTIONS}
+        self.seen_order = {direction: deque() for direction in DIRECTIONS}  # Oldest ID first, for eviction
+        self.crossings = 0
+        self.unique = 0
+
+    def reset(self):
+        # Cleared in place: StreamAnalyzer hands these containers out as vehicle_in / vehicle_out / data
+        for direction in DIRECTIONS:
+            self.totals[direction].clear()
+            self.events[direction].clear()
+            self.seen[direction].clear()
+            self.seen_order[direction].clear()
+        self.lane_counts.clear()
+        self.crossings = 0
+        self.unique = 0
+
+    def add(self, vehicle):
+        """
+        Counts one crossing; returns True if it is the first one of this track ID in its direction.
+        """
+        direction = vehicle.direction if vehicle.direction == "in" else "out"
+        totals = self.totals[direction]
+        totals[vehicle.name] = totals.get(vehicle.name, 0) + 1
+        self.lane_counts[(direction, vehicle.name, vehicle.lane)] += 1
+        self.crossings += 1
+
+        seen = self.seen[direction]
+        if vehicle.id in seen:
+            return False
+        seen.add(vehicle.id)
+        order = self.seen_order[direction]
+        order.append(vehicle.id)
+        if len(order) > self.dedup_window:
+            seen.discard(order.popleft())
+        self.events[direction].append(vehicle)
+        self.unique += 1
+        return True
+
+    def stats(self):
+        return {
+            "crossings": self.crossings,
+            "unique": self.unique,
+            "kept_events": sum(len(events) for events in self.events.values()),
+        }
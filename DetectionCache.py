@@ -0,0 +1,125 @@
+import hashlib
+import os
+
+import numpy as np
+
+from Detections import Detections
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """
+    SHA-1 of a file's content, read in chunks so large videos are never loaded whole.
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(video_path, model_path, classes, **options):
+    """
+    Key for the detections of one video: its content hash, the model weights, the class filter
+    and any extra inference options that change what the tracker sees.
+    """
+    model_id = file_hash(model_path) if os.path.isfile(model_path) else str(model_path)
+    parts = [file_hash(video_path), model_id, ",".join(str(c) for c in sorted(classes))]
+    parts += [f"{name}={options[name]}" for name in sorted(options)]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+class DetectionCacheWriter:
+    """
+    Collects per-frame Detections in frame order and saves them as one compact .npz file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.boxes = []
+        self.classes = []
+        self.ids = []
+        self.counts = []  # Boxes per frame, -1 for a frame without a result
+        self.stale = []  # Whether each frame's detections were carried forward (Detections.stale)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, detections):
+        if detections is None:
+            self.counts.append(-1)
+            self.stale.append(False)
+            return
+        self.counts.append(len(detections.boxes))
+        self.stale.append(detections.stale)
+        # Boxes are stored in full-frame coordinates, whatever crop they were detected in
+        x, y = detections.offset
+        boxes = np.asarray(detections.boxes, dtype=np.float32).reshape(-1, 4) + np.array([x, y, x, y], dtype=np.float32)
+        self.boxes.append(boxes)
+        self.classes.extend(detections.class_indices)
+        self.ids.extend(-1 if i is None else i for i in detections.track_ids)
+
+    def save(self):
+        """
+        Writes the cache atomically, so an interrupted run never leaves a truncated file behind.
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        counts = np.array(self.counts, dtype=np.int32)
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.maximum(counts, 0))
+        boxes = np.concatenate(self.boxes) if self.boxes else np.zeros((0, 4), dtype=np.float32)
+
+        tmp_path = self.path + ".tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            offsets=offsets,
+            has_result=counts >= 0,
+            stale=np.array(self.stale, dtype=bool),
+            boxes=boxes,
+            classes=np.array(self.classes, dtype=np.int16),
+            ids=np.array(self.ids, dtype=np.int32),
+        )
+        os.replace(tmp_path, self.path)
+
+
+class DetectionCache:
+    """
+    Read side of the cache: per-frame Detections looked up by 0-based frame position.
+    """
+
+    def __init__(self, path):
+        with np.load(path) as cache:
+            self.offsets = cache["offsets"]
+            self.has_result = cache["has_result"]
+            self.boxes = cache["boxes"]
+            self.classes = cache["classes"]
+            self.ids = cache["ids"]
+            # Caches written before stale frames were recorded have none
+            self.stale = cache["stale"] if "stale" in cache.files else np.zeros(len(self.has_result), dtype=bool)
+
+    def __len__(self):
+        return len(self.has_result)
+
+    def get(self, index):
+        if index < 0 or index >= len(self) or not self.has_result[index]:
+            return None
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return Detections(
+            boxes=self.boxes[start:end],
+            class_indices=self.classes[start:end].tolist(),
+            track_ids=[None if i < 0 else i for i in self.ids[start:end].tolist()],
+            stale=bool(self.stale[index]),
+        )
+
+    @staticmethod
+    def path_for(cache_dir, key):
+        return os.path.join(cache_dir, f"{key}.npz")
+
+    @staticmethod
+    def load(cache_dir, key):
+        """
+        Returns the cache for key, or None when it has not been built yet.
+        """
+        path = DetectionCache.path_for(cache_dir, key)
+        if not os.path.isfile(path):
+            return None
+        return DetectionCache(path)
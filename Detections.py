@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class Detections:
+    """
+    Tracked boxes for one frame, as handed from the inference stage to draw_boxes.
+    """
+    boxes: np.ndarray  # (N, 4) xyxy boxes
+    class_indices: list
+    track_ids: list
+    offset: tuple = (0, 0)  # (x, y) of the inference crop inside the full frame
+    stale: bool = False  # Carried forward from an earlier frame without detecting: drawn, but not tracked or counted
+
+    @staticmethod
+    def from_result(result):
+        """
+        Extracts boxes, classes and track IDs from a single ultralytics tracking result.
+        Returns None when the result has no boxes.
+        """
+        if result.boxes.data is None:
+            return None
+
+        boxes = result.boxes.xyxy.cpu().numpy()
+        track_ids = result.boxes.id
+        track_ids = track_ids.int().cpu().tolist() if track_ids is not None else [None] * len(boxes)
+        class_indices = result.boxes.cls.int().cpu().tolist()
+        return Detections(boxes=boxes, class_indices=class_indices, track_ids=track_ids)
+
+    @staticmethod
+    def from_tracks(tracks):
+        """
+        Builds Detections from the (N, 8) array returned by an ultralytics tracker's update():
+        x1, y1, x2, y2, track_id, score, class, detection_index.
+        """
+        tracks = np.asarray(tracks).reshape(-1, 8)
+        return Detections(
+            boxes=tracks[:, :4].astype(np.float32),
+            class_indices=tracks[:, 6].astype(int).tolist(),
+            track_ids=tracks[:, 4].astype(int).tolist(),
+        )
@@ -0,0 +1,115 @@
+import logging
+import os
+import time
+
+FSYNC_POLICIES = ("never", "close", "flush")
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(vehicle):
+    return (f"Object ID: {vehicle.id}, Velocity: {vehicle.velocity}, Direction: {vehicle.direction}, "
+            f"Lane: {vehicle.lane}, Label: {vehicle.name}\n")
+
+
+def repair_torn_tail(path):
+    """
+    Cuts a partial last line left by a crash mid-write, so appending resumes on a record boundary.
+    Returns the number of bytes removed.
+    """
+    if not os.path.isfile(path):
+        return 0
+    with open(path, 'rb+') as file:
+        size = file.seek(0, os.SEEK_END)
+        if size == 0:
+            return 0
+        # Walk back in blocks until the last newline is found
+        end = size
+        block = 4096
+        while end > 0:
+            start = max(0, end - block)
+            file.seek(start)
+            chunk = file.read(end - start)
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                keep = start + newline + 1
+                break
+            end = start
+        else:
+            keep = 0
+        if keep < size:
+            file.truncate(keep)
+        return size - keep
+
+
+class EventLog:
+    """
+    Append-as-you-go event log: every counted vehicle becomes one line of data.txt as soon as it
+    is recorded, instead of the whole log being written after the video.
+
+    Lines are buffered and written together every flush_seconds (or every max_buffered events),
+    each record being a complete newline-terminated line. On open a partial last line left by a
+    crash is cut off, so a log that was being written when the process died stays readable and
+    later runs append cleanly after it. fsync controls durability: "never", on "close" (default)
+    or after every "flush".
+    """
+
+    def __init__(self, path, flush_seconds=1.0, max_buffered=256, fsync="close"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync!r}, expected one of {FSYNC_POLICIES}")
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.max_buffered = max_buffered
+        self.fsync = fsync
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        repaired = repair_torn_tail(path)
+        if repaired:
+            logger.warning(f"Event log {path}: dropped {repaired} bytes of a partial record from an interrupted run")
+        self.file = open(path, 'a', encoding='utf-8')
+        self.buffer = []
+        self.last_flush = time.perf_counter()
+        self.written = 0
+        self.flushes = 0
+
+    def write(self, vehicle):
+        self.buffer.append(format_event(vehicle))
+        if len(self.buffer) >= self.max_buffered:
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self):
+        """
+        Flushes buffered events once flush_seconds have passed; cheap enough to call every frame.
+        """
+        if self.buffer and time.perf_counter() - self.last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        if self.file is None:
+            return
+        if self.buffer:
+            self.file.write("".join(self.buffer))
+            self.written += len(self.buffer)
+            self.buffer = []
+        self.file.flush()
+        if self.fsync == "flush":
+            os.fsync(self.file.fileno())
+        self.flushes += 1
+        self.last_flush = time.perf_counter()
+
+    def close(self):
+        if self.file is None:
+            return
+        self.flush()
+        if self.fsync == "close":
+            os.fsync(self.file.fileno())
+        self.file.close()
+        self.file = None
+
+    def stats(self):
+        return {
+            "events": self.written + len(self.buffer),
+            "flushes": self.flushes,
+        }
@@ -0,0 +1,167 @@
+import os
+import sqlite3
+import time
+from collections import Counter
+
+ROLLUP_SECONDS = 60  # Granularity of the lane_counts rollup
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,       -- video file or camera the event came from
+    track_id INTEGER NOT NULL,
+    direction TEXT NOT NULL,    -- in / out
+    lane INTEGER NOT NULL,      -- 1-based lane number
+    class TEXT NOT NULL,        -- vehicle class name
+    speed REAL NOT NULL,        -- km/h
+    frame INTEGER NOT NULL,     -- frame index within the source
+    time REAL NOT NULL,         -- event time in seconds: time_origin + frame / fps
+    recorded_at REAL NOT NULL   -- wall-clock time the event was recorded
+);
+CREATE INDEX IF NOT EXISTS events_by_time ON events (source, time);
+CREATE INDEX IF NOT EXISTS events_by_class ON events (class, speed);
+
+-- Rollups kept up to date in the same transaction as the inserts
+CREATE TABLE IF NOT EXISTS lane_counts (
+    source TEXT NOT NULL,
+    lane INTEGER NOT NULL,
+    direction TEXT NOT NULL,
+    class TEXT NOT NULL,
+    minute INTEGER NOT NULL,    -- time // 60
+    count INTEGER NOT NULL,
+    PRIMARY KEY (source, minute, lane, direction, class)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS speed_counts (
+    source TEXT NOT NULL,
+    class TEXT NOT NULL,
+    speed INTEGER NOT NULL,     -- km/h, rounded
+    count INTEGER NOT NULL,
+    PRIMARY KEY (class, speed, source)
+) WITHOUT ROWID;
+"""
+
+
+class EventStore:
+    """
+    Structured event store in SQLite, used as a StreamAnalyzer sink next to the text log.
+    Events are buffered and inserted in batches, one transaction per batch, at least every
+    flush_seconds. Each batch also updates two small rollups, per-minute lane counts and
+    per-class speed histograms, which the aggregate queries below read instead of the raw events.
+
+    time is time_origin + frame / fps: seconds into the video for files (origin 0) and Unix time
+    for live streams (origin = start of the run), so buckets line up with the footage either way.
+    """
+
+    def __init__(self, path, source, fps=None, time_origin=0.0, batch_size=500, flush_seconds=1.0):
+        self.path = path
+        self.source = str(source)
+        self.fps = fps or 30
+        self.time_origin = time_origin
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Written from the annotate stage thread, opened and closed from the run's thread; never concurrently
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.rows = []
+        self.last_flush = time.perf_counter()
+        self.inserted = 0
+
+    def write(self, vehicle):
+        self.rows.append((self.source, vehicle.id, vehicle.direction, vehicle.lane, vehicle.name, vehicle.speed,
+                          vehicle.frame, self.time_origin + vehicle.frame / self.fps, vehicle.recorded_at))
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self):
+        if self.rows and time.perf_counter() - self.last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        if self.rows and self.connection is not None:
+            lanes = Counter((source, lane, direction, name, int(t // ROLLUP_SECONDS))
+                            for source, _, direction, lane, name, _, _, t, _ in self.rows)
+            speeds = Counter((source, name, int(round(speed))) for source, _, _, _, name, speed, _, _, _ in self.rows)
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO events (source, track_id, direction, lane, class, speed, frame, time, recorded_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self.rows)
+                self.connection.executemany(
+                    "INSERT INTO lane_counts (source, lane, direction, class, minute, count) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT DO UPDATE SET count = count + excluded.count",
+                    [key + (count,) for key, count in lanes.items()])
+                self.connection.executemany(
+                    "INSERT INTO speed_counts (source, class, speed, count) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT DO UPDATE SET count = count + excluded.count",
+                    [key + (count,) for key, count in speeds.items()])
+            self.inserted += len(self.rows)
+            self.rows = []
+        self.last_flush = time.perf_counter()
+
+    def close(self):
+        if self.connection is None:
+            return
+        self.flush()
+        self.connection.close()
+        self.connection = None
+
+    def stats(self):
+        return {"events": self.inserted + len(self.rows)}
+
+
+def counts_per_lane(connection, bucket_seconds=900, source=None, start=None, end=None):
+    """
+    [(lane, direction, bucket_start, count)] with events grouped into bucket_seconds windows,
+    optionally for one source and the time range [start, end). Whole-minute buckets and bounds
+    are answered from the lane_counts rollup; anything finer falls back to the raw events.
+    """
+    exact = all(value is None or value % ROLLUP_SECONDS == 0 for value in (bucket_seconds, start, end))
+    table, column, scale = ("lane_counts", "minute", ROLLUP_SECONDS) if exact else ("events", "time", 1)
+    count = "SUM(count)" if exact else "COUNT(*)"
+
+    clauses, params = [], [scale, bucket_seconds, bucket_seconds]
+    if source is not None:
+        clauses.append("source = ?")
+        params.append(str(source))
+    if start is not None:
+        clauses.append(f"{column} >= ?")
+        params.append(start / scale)
+    if end is not None:
+        clauses.append(f"{column} < ?")
+        params.append(end / scale)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return connection.execute(
+        f"SELECT lane, direction, CAST({column} * ? / ? AS INTEGER) * ? AS bucket, {count} FROM {table} {where} "
+        f"GROUP BY lane, direction, bucket ORDER BY lane, direction, bucket", params).fetchall()
+
+
+def speed_percentiles(connection, percentiles=(50, 85, 95), source=None):
+    """
+    {class: {percentile: speed}} using nearest-rank percentiles over the speed_counts histogram.
+    Speeds are whole km/h (draw_boxes rounds them), so this matches sorting every event.
+    """
+    where, params = ("WHERE source = ?", [str(source)]) if source is not None else ("", [])
+    histogram = {}
+    for name, speed, count in connection.execute(
+            f"SELECT class, speed, SUM(count) FROM speed_counts {where} GROUP BY class, speed ORDER BY class, speed",
+            params):
+        histogram.setdefault(name, []).append((speed, count))
+
+    result = {}
+    for name, counts in histogram.items():
+        total = sum(count for _, count in counts)
+        result[name] = {}
+        for p in percentiles:
+            rank = max(1, -(-p * total // 100))  # ceil(p / 100 * total)
+            seen = 0
+            for speed, count in counts:
+                seen += count
+                if seen >= rank:
+                    result[name][p] = speed
+                    break
+    return result
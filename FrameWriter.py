@@ -0,0 +1,70 @@
+import os
+
+import cv2
+
+
+class FrameWriter:
+    """
+    Owns the cv2.VideoWriter for the whole run. The encode stage of a Pipeline calls encode()
+    for every annotated frame as it is produced, so memory stays flat no matter how long the
+    video is, and finalize() once the run ends.
+    With segment_seconds set, output is rolled into numbered segment files; every closed segment
+    is a finalized, playable file while processing continues, and on_segment(path) is called for it.
+    Without it the output is a single file that is only playable once finalize() has released it
+    (an mp4 is indexed on release), so anything that plays output mid-run needs segments.
+    """
+
+    def __init__(self, output_path, fps, frame_size, fourcc='mp4v', segment_seconds=None, on_segment=None):
+        self.output_path = output_path
+        self.fps = fps if fps and fps > 0 else 30
+        self.frame_size = frame_size  # (width, height)
+        self.fourcc = cv2.VideoWriter_fourcc(*fourcc)
+        self.segment_frames = int(segment_seconds * self.fps) if segment_seconds else 0
+        self.on_segment = on_segment
+
+        self.frames_written = 0
+        self.segments = []  # Paths of finalized segment files
+        self.writer = None
+        self.current_path = None
+
+        # Create output directory if it doesn't exist
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        self._open_writer()
+
+    def _segment_path(self, index):
+        root, ext = os.path.splitext(self.output_path)
+        return f"{root}_{index:04d}{ext}"
+
+    def _open_writer(self):
+        if self.segment_frames:
+            self.current_path = self._segment_path(len(self.segments))
+        else:
+            self.current_path = self.output_path
+        self.writer = cv2.VideoWriter(self.current_path, self.fourcc, self.fps, self.frame_size)
+
+    def _close_writer(self):
+        self.writer.release()
+        self.segments.append(self.current_path)
+        self.writer = None
+        if self.on_segment is not None:
+            self.on_segment(self.current_path)
+
+    def encode(self, frame):
+        """
+        Encodes one frame on the calling thread.
+        """
+        if self.writer is None:
+            self._open_writer()
+        self.writer.write(frame)
+        self.frames_written += 1
+
+        # Roll over to a new segment so the finished one becomes playable
+        if self.segment_frames and self.frames_written % self.segment_frames == 0:
+            self._close_writer()
+
+    def finalize(self):
+        """
+        Releases the current writer so the last file (or segment) is complete on disk.
+        """
+        if self.writer is not None:
+            self._close_writer()
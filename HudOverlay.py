@@ -0,0 +1,146 @@
+import cv2
+import numpy as np
+
+from Sprites import Sprite
+
+PANEL_COLOR = [85, 45, 255]
+TITLE_HEIGHT = 50  # Rows of the title bar above the first count row
+ROW_HEIGHT = 40
+PANEL_WIDTH = 540  # Panels (bars with round caps included) never extend further than this from their side
+
+
+def draw_panel_title(img, direction, width, top=0):
+    """
+    Panel background bar and title; direction "in" is the right-hand panel, "out" the left one.
+    top shifts everything up, for drawing into a band of a larger canvas.
+    """
+    if direction == "in":
+        cv2.line(img, (width - 500, 25 - top), (width, 25 - top), PANEL_COLOR, 40)
+        cv2.putText(img, 'Number of Vehicles Entering', (width - 500, 35 - top), 0, 1, [225, 255, 255], thickness=2,
+                    lineType=cv2.LINE_AA)
+    else:
+        cv2.line(img, (20, 25 - top), (500, 25 - top), PANEL_COLOR, 40)
+        cv2.putText(img, 'Number of Vehicles Leaving', (11, 35 - top), 0, 1, [225, 255, 255], thickness=2,
+                    lineType=cv2.LINE_AA)
+
+
+def draw_panel_row(img, direction, width, idx, label, count, top=0):
+    """
+    One "label: count" row of a panel.
+    """
+    y = 65 + (idx * ROW_HEIGHT) - top
+    if direction == "in":
+        cv2.line(img, (width - 150, y), (width, y), PANEL_COLOR, 30)
+        cv2.putText(img, f"{label}: {count}", (width - 150, y + 10), 0, 1, [255, 255, 255], thickness=2,
+                    lineType=cv2.LINE_AA)
+    else:
+        cv2.line(img, (20, y), (127, y), PANEL_COLOR, 30)
+        cv2.putText(img, f"{label}: {count}", (11, y + 10), 0, 1, [225, 255, 255], thickness=2, lineType=cv2.LINE_AA)
+
+
+class _Panel:
+    """
+    Cached rendering of one count panel on a PANEL_WIDTH-wide canvas placed at the panel's side
+    of the frame. The panel is kept drawn on a black and a white canvas, the Sprite composited
+    every frame is built from them, and a row is re-rendered only when its label or count changes.
+    """
+
+    def __init__(self, direction):
+        self.direction = direction
+        self.frame_width = None
+        self.width = None  # Canvas width
+        self.left = 0  # x of the canvas inside the frame
+        self.rows = []
+        self.black = None
+        self.white = None
+        self.sprite = None
+
+    def _render_band(self, top, bottom, draw):
+        for canvas, value in ((self.black, 0), (self.white, 255)):
+            band = canvas[top:bottom]
+            band[:] = value
+            draw(band, top)
+
+    def _render_row(self, idx, row):
+        def draw(band, top):
+            draw_panel_row(band, self.direction, self.width, idx, row[0], row[1], top=top)
+
+        top = TITLE_HEIGHT + idx * ROW_HEIGHT
+        self._render_band(top, top + ROW_HEIGHT, draw)
+
+    def _rebuild(self, frame_width, rows):
+        # The "in" panel is right-aligned: drawing it for a PANEL_WIDTH-wide frame gives the same
+        # pixels as the right-most PANEL_WIDTH columns of the real frame
+        self.width = min(PANEL_WIDTH, frame_width)
+        self.left = frame_width - self.width if self.direction == "in" else 0
+        height = TITLE_HEIGHT + ROW_HEIGHT * len(rows)
+        self.black = np.zeros((height, self.width, 3), dtype=np.uint8)
+        self.white = np.full((height, self.width, 3), 255, dtype=np.uint8)
+        self._render_band(0, TITLE_HEIGHT, lambda band, top: draw_panel_title(band, self.direction, self.width, top=top))
+        for idx, row in enumerate(rows):
+            self._render_row(idx, row)
+
+    def update(self, frame_width, rows):
+        if rows == self.rows and frame_width == self.frame_width:
+            return
+        if frame_width != self.frame_width or len(rows) != len(self.rows):
+            self.frame_width = frame_width
+            self._rebuild(frame_width, rows)
+        else:
+            for idx, (old, new) in enumerate(zip(self.rows, rows)):
+                if old != new:
+                    self._render_row(idx, new)
+        self.rows = list(rows)
+
+        self.sprite = Sprite(self.black, self.white)
+
+    def composite(self, img):
+        # Like show_in / show_out, a panel without any counted vehicle is not drawn at all
+        if self.rows:
+            self.sprite.draw(img, self.left, 0)
+
+
+class HudOverlay:
+    """
+    Composites the static parts of the annotation: lane lines and the in/out count panels.
+    Lane lines are rendered once per lane configuration and copied through a mask; panels are
+    re-rendered only when a count changes. Output matches drawing the elements directly, up to
+    a rounding difference of at most one grey level on anti-aliased text edges.
+    """
+
+    def __init__(self):
+        self.lane_key = None
+        self.lane_bounds = None
+        self.lane_layer = None
+        self.lane_mask = None
+        self.panels = {"in": _Panel("in"), "out": _Panel("out")}
+
+    def draw_lanes(self, img, lanes):
+        key = (img.shape, tuple((lane.start_x, lane.width, lane.y, lane.color, lane.thickness) for lane in lanes))
+        if key != self.lane_key:
+            self.lane_key = key
+            layer = np.zeros_like(img)
+            mask = np.zeros(img.shape[:2], dtype=np.uint8)
+            for lane in lanes:
+                lane.draw(layer)
+                cv2.line(mask, lane.start(), lane.end(), 255, lane.thickness)
+            drawn = np.argwhere(mask)
+            if len(drawn) == 0:
+                self.lane_bounds = None
+            else:
+                (y1, x1), (y2, x2) = drawn.min(axis=0), drawn.max(axis=0) + 1
+                self.lane_bounds = (y1, y2, x1, x2)
+                self.lane_layer = layer[y1:y2, x1:x2].copy()
+                self.lane_mask = mask[y1:y2, x1:x2].copy()
+        if self.lane_bounds is not None:
+            y1, y2, x1, x2 = self.lane_bounds
+            cv2.copyTo(self.lane_layer, self.lane_mask, img[y1:y2, x1:x2])
+
+    def draw_panels(self, img, width, vehicle_in, vehicle_out):
+        """
+        vehicle_in / vehicle_out map each class to its count, in panel row order.
+        """
+        for direction, vehicles in (("in", vehicle_in), ("out", vehicle_out)):
+            panel = self.panels[direction]
+            panel.update(width, list(vehicles.items()))
+            panel.composite(img)
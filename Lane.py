@@ -1,8 +1,11 @@
+import json
 import random
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 import cv2
 
+from Calibration import Calibration
+
 
 @dataclass
 class Lane:
@@ -48,3 +51,57 @@ class Lane:
             (247, 141, 187)  # Cream
         ]
         return lst[idx]
+
+
+def save_lanes(lanes, path, calibration=None):
+    """
+    Saves a lane configuration (enabled lanes followed by the crossing) as JSON. With a
+    Calibration the file holds {"lanes": [...], "calibration": {...}}, otherwise just the list.
+    """
+    entries = [asdict(lane) for lane in lanes]
+    if calibration is not None:
+        entries = {"lanes": entries, "calibration": calibration.to_dict()}
+    with open(path, 'w') as file:
+        json.dump(entries, file, indent=2)
+
+
+def load_lanes(path):
+    """
+    Loads a lane configuration written by save_lanes; the crossing stays the last entry.
+    """
+    with open(path) as file:
+        entries = json.load(file)
+    if isinstance(entries, dict):
+        entries = entries["lanes"]
+    lanes = []
+    for entry in entries:
+        entry["color"] = tuple(entry["color"])
+        lanes.append(Lane(**entry))
+    return lanes
+
+
+def load_calibration(path):
+    """
+    The Calibration saved with a lane configuration, or None if the camera was not calibrated.
+    """
+    with open(path) as file:
+        entries = json.load(file)
+    if isinstance(entries, dict) and entries.get("calibration"):
+        return Calibration.from_dict(entries["calibration"])
+    return None
+
+
+def crossing_roi(lanes, frame_width, frame_height, margin=200):
+    """
+    Region (x1, y1, x2, y2) that can affect counts: the span of the enabled lanes around the
+    crossing line (the last entry), widened by margin pixels and clipped to the frame.
+    """
+    crossing = lanes[-1]
+    lane_lines = lanes[:-1] or [crossing]
+    x1 = max(0, min(lane.start_x for lane in lane_lines) - margin)
+    x2 = min(frame_width, max(lane.start_x + lane.width for lane in lane_lines) + margin)
+    top = min([crossing.y] + [lane.y for lane in lane_lines])
+    bottom = max([crossing.y] + [lane.y for lane in lane_lines])
+    y1 = max(0, top - margin)
+    y2 = min(frame_height, bottom + margin)
+    return x1, y1, x2, y2
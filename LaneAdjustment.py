@@ -3,11 +3,13 @@ from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtGui import QImage, QPixmap
 from dataclasses import dataclass
 import cv2
-from Lane import Lane
+from Calibration import Calibration
+from Lane import Lane, save_lanes
 
 
 class LaneAdjustmentApp(QtWidgets.QWidget):
     lanes_passed = pyqtSignal(list)  # Define the signal
+    calibration_passed = pyqtSignal(object)  # Calibration, or None if the camera was not calibrated
     # window_closed = pyqtSignal()
 
     def __init__(self, frame, parent=None):
@@ -44,6 +46,12 @@ class LaneAdjustmentApp(QtWidgets.QWidget):
             direction="center"
         )
 
+        # Ground-plane calibration: four road points clicked on the frame, then the rectangle's size
+        self.calibration = None
+        self.calibration_points = []
+        self.calibrating = False
+        self.display_scale = 1.0  # Displayed pixels per frame pixel
+
         # UI components for lane controls
         self.lane_controls = []
 
@@ -62,6 +70,8 @@ class LaneAdjustmentApp(QtWidgets.QWidget):
         self.frame_label = QtWidgets.QLabel()
         self.frame_label.setStyleSheet("background-color: black;")
         self.frame_label.setFixedSize(800, 500)
+        # Top-left aligned, so a click maps to frame pixels by the display scale alone
+        self.frame_label.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop)
         self.layout.addWidget(self.frame_label)
 
         # Lane Controls Layout
@@ -189,8 +199,18 @@ class LaneAdjustmentApp(QtWidgets.QWidget):
         self.ok_button.setFixedWidth(80)
         self.ok_button.clicked.connect(self.close)
 
+        self.save_button = QtWidgets.QPushButton("Save")
+        self.save_button.setFixedWidth(80)
+        self.save_button.clicked.connect(self.save_configuration)
+
+        self.calibrate_button = QtWidgets.QPushButton("Calibrate")
+        self.calibrate_button.setFixedWidth(80)
+        self.calibrate_button.clicked.connect(self.start_calibration)
+
         bottom_layout = QtWidgets.QHBoxLayout()
         bottom_layout.addWidget(self.ok_button)
+        bottom_layout.addWidget(self.save_button)
+        bottom_layout.addWidget(self.calibrate_button)
 
         self.layout.addLayout(bottom_layout)
 
@@ -270,12 +290,23 @@ class LaneAdjustmentApp(QtWidgets.QWidget):
             if lane.enabled:
                 lane.draw(frame_copy)
 
+        # Calibration rectangle: the points being clicked, or the finished calibration
+        points = self.calibration_points or (self.calibration.image_points if self.calibration else [])
+        points = [(int(round(x)), int(round(y))) for x, y in points]
+        for i, point in enumerate(points):
+            cv2.circle(frame_copy, point, 6, (0, 255, 255), -1)
+            if i > 0:
+                cv2.line(frame_copy, points[i - 1], point, (0, 255, 255), 2)
+        if len(points) == 4:
+            cv2.line(frame_copy, points[3], points[0], (0, 255, 255), 2)
+
         self.display_frame(frame_copy)
 
     def display_frame(self, frame):
         """Display the frame in the QLabel."""
         height, width, _ = frame.shape
         scale_factor = 800 / width
+        self.display_scale = scale_factor
         new_width = 800
         new_height = int(height * scale_factor)
         resized_frame = cv2.resize(frame, (new_width, new_height))
@@ -285,11 +316,64 @@ class LaneAdjustmentApp(QtWidgets.QWidget):
                           QImage.Format_RGB888)
         self.frame_label.setPixmap(QPixmap.fromImage(qt_image))
 
+    def enabled_lanes(self):
+        """Enabled lanes followed by the crossing, in the order draw_boxes expects."""
+        enabled_lanes = [lane for lane in self.lanes if lane.enabled]
+        enabled_lanes.append(self.crossing)
+        return enabled_lanes
+
+    def start_calibration(self):
+        """Start clicking the four corners of a road rectangle of known size."""
+        self.calibrating = True
+        self.calibration_points = []
+        self.calibrate_button.setText("Click 4...")
+        QtWidgets.QMessageBox.information(
+            self, "Calibrate",
+            "Click the corners of a rectangle on the road (e.g. lane markings) in this order:\n"
+            "far-left, far-right, near-right, near-left.\n"
+            "You will then be asked for its width across and length along the road in metres.")
+        self.render_frame_with_lanes()
+
+    def mousePressEvent(self, event):
+        """Collect calibration points while calibrating."""
+        if not self.calibrating:
+            return super().mousePressEvent(event)
+        pos = self.frame_label.mapFrom(self, event.pos())
+        x, y = pos.x() / self.display_scale, pos.y() / self.display_scale
+        if not (0 <= x < self.frame_width and 0 <= y < self.frame_height):
+            return
+        self.calibration_points.append((x, y))
+        self.render_frame_with_lanes()
+        if len(self.calibration_points) == 4:
+            self.finish_calibration()
+
+    def finish_calibration(self):
+        """Ask for the rectangle's size and build the ground-plane homography."""
+        self.calibrating = False
+        self.calibrate_button.setText("Calibrate")
+        width, ok_width = QtWidgets.QInputDialog.getDouble(self, "Calibrate", "Width across the road (m):",
+                                                           3.5, 0.1, 1000, 2)
+        length, ok_length = (QtWidgets.QInputDialog.getDouble(self, "Calibrate", "Length along the road (m):",
+                                                              10.0, 0.1, 1000, 2) if ok_width else (0, False))
+        if ok_width and ok_length:
+            try:
+                self.calibration = Calibration.from_rectangle(self.calibration_points, width, length)
+            except ValueError as e:
+                QtWidgets.QMessageBox.warning(self, "Calibrate", str(e))
+        self.calibration_points = []
+        self.render_frame_with_lanes()
+
+    def save_configuration(self):
+        """Save the current lanes (and calibration, if any) to a JSON file for headless batch runs."""
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Lane Configuration", "lanes.json",
+                                                        "JSON Files (*.json)")
+        if path:
+            save_lanes(self.enabled_lanes(), path, calibration=self.calibration)
+
     def closeEvent(self, event):
         """Override closeEvent to emit the lanes data when the window is closed."""
         # Emit the lanes data when the window is closed
-        enabled_lanes = [lane for lane in self.lanes if lane.enabled]
-        enabled_lanes.append(self.crossing)
-        self.lanes_passed.emit(enabled_lanes)
+        self.calibration_passed.emit(self.calibration)
+        self.lanes_passed.emit(self.enabled_lanes())
         # self.window_closed.emit()
         event.accept()
@@ -0,0 +1,147 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+
+DROP_POLICIES = ("drop_oldest", "drop_newest", "drop_every_k")
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSource(threading.Thread):
+    """
+    Continuous frame source for live cameras (RTSP/HTTP URLs, device indices) or a looping file.
+    A capture thread reads frames as they arrive into a bounded buffer; when the consumer falls
+    behind, the overload policy decides which frames are dropped instead of letting them pile up:
+
+    - drop_oldest:  a full buffer discards its oldest frame to make room for the new one
+    - drop_newest:  a full buffer discards the frame that just arrived
+    - drop_every_k: once the buffer is half full every k-th arriving frame is discarded,
+                    and a full buffer discards the new frame
+    """
+
+    def __init__(self, source, buffer_size=8, policy="drop_oldest", drop_every=2, loop=False,
+                 realtime=None, reconnect_seconds=2.0):
+        super().__init__(daemon=True)
+        if policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy {policy!r}, expected one of {DROP_POLICIES}")
+        self.source = source
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self.drop_every = max(2, drop_every)
+        self.loop = loop
+        # Files are paced at their own FPS so they behave like a camera; live sources are not
+        self.realtime = loop if realtime is None else realtime
+        self.reconnect_seconds = reconnect_seconds
+
+        self.buffer = deque()
+        self.condition = threading.Condition()
+        self.stopped = threading.Event()
+        self.ended = False
+
+        self.cap = cv2.VideoCapture(source)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open stream: {source}")
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        self.captured = 0
+        self.dropped = 0
+        self._overload_count = 0
+
+    def _push(self, item):
+        with self.condition:
+            full = len(self.buffer) >= self.buffer_size
+            if self.policy == "drop_oldest":
+                if full:
+                    self.buffer.popleft()
+                    self.dropped += 1
+                self.buffer.append(item)
+            elif self.policy == "drop_newest":
+                if full:
+                    self.dropped += 1
+                    return
+                self.buffer.append(item)
+            else:
+                if len(self.buffer) >= self.buffer_size // 2:
+                    self._overload_count += 1
+                    if full or self._overload_count % self.drop_every == 0:
+                        self.dropped += 1
+                        return
+                else:
+                    self._overload_count = 0
+                self.buffer.append(item)
+            self.condition.notify()
+
+    def _reopen(self):
+        if self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            return True
+        if isinstance(self.source, str) and os.path.isfile(self.source):
+            return False  # A file that is not looped simply ends
+        # Live feeds: try to reconnect instead of ending the stream
+        self.cap.release()
+        while not self.stopped.is_set():
+            time.sleep(self.reconnect_seconds)
+            self.cap = cv2.VideoCapture(self.source)
+            if self.cap.isOpened():
+                logger.info(f"Reconnected to {self.source}")
+                return True
+        return False
+
+    def run(self):
+        interval = 1.0 / self.fps
+        next_time = time.perf_counter()
+        reopen_failures = 0
+        while not self.stopped.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                reopen_failures += 1
+                # A file that cannot be read from the start again is not worth looping
+                if reopen_failures > 3 or not self._reopen():
+                    break
+                continue
+            reopen_failures = 0
+            self.captured += 1
+            self._push((self.captured, frame, time.perf_counter()))
+
+            if self.realtime:
+                next_time += interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_time = time.perf_counter()
+
+        self.cap.release()
+        with self.condition:
+            self.ended = True
+            self.condition.notify_all()
+
+    def get(self, timeout=0.5):
+        """
+        Next buffered (index, frame, captured_at) tuple; None once the source has ended or stopped.
+        Indices count every captured frame, so dropped frames show up as gaps.
+        """
+        with self.condition:
+            while not self.buffer:
+                if self.ended or self.stopped.is_set():
+                    return None
+                self.condition.wait(timeout)
+            return self.buffer.popleft()
+
+    def stop(self):
+        self.stopped.set()
+        with self.condition:
+            self.condition.notify_all()
+
+    def stats(self):
+        return {
+            "captured": self.captured,
+            "dropped": self.dropped,
+            "buffered": len(self.buffer),
+        }
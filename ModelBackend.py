@@ -0,0 +1,72 @@
+import logging
+import os
+import shutil
+
+from ultralytics import YOLO
+
+BACKENDS = ("pytorch", "onnx", "openvino")
+
+logger = logging.getLogger(__name__)
+
+
+def export_path(model_path, backend, int8=False):
+    """
+    Where the exported artifact of model_path lives: next to the weights, one per backend/precision.
+    """
+    stem = os.path.splitext(model_path)[0]
+    if backend == "onnx":
+        return f"{stem}.onnx"
+    if backend == "openvino":
+        return f"{stem}_int8_openvino_model" if int8 else f"{stem}_openvino_model"
+    return model_path
+
+
+def _is_stale(artifact, model_path):
+    if not os.path.exists(artifact):
+        return True
+    # Re-export when the weights changed after the artifact was built
+    return os.path.isfile(model_path) and os.path.getmtime(artifact) < os.path.getmtime(model_path)
+
+
+def ensure_exported(model_path, backend="pytorch", int8=False, int8_data=None, imgsz=640):
+    """
+    Exports model_path for a CPU backend once and returns the path of the cached artifact.
+    ONNX is exported with a dynamic batch axis so batched inference keeps working. INT8 is
+    only offered for OpenVINO, where it is calibrated post-training on int8_data (a dataset
+    YAML, the ultralytics default when not given).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    if int8 and backend != "openvino":
+        raise ValueError("INT8 quantization is only available with the openvino backend")
+    if backend == "pytorch":
+        return model_path
+
+    artifact = export_path(model_path, backend, int8)
+    if not _is_stale(artifact, model_path):
+        return artifact
+
+    logger.info(f"Exporting {model_path} to {backend}{' (INT8)' if int8 else ''}, this only happens once...")
+    options = {"format": backend, "imgsz": imgsz}
+    if backend == "onnx":
+        options["dynamic"] = True
+    if int8:
+        options["int8"] = True
+        if int8_data:
+            options["data"] = int8_data
+    exported = str(YOLO(model_path).export(**options)).rstrip(os.sep)
+
+    if os.path.abspath(exported) != os.path.abspath(artifact):
+        if os.path.isdir(artifact):
+            shutil.rmtree(artifact)
+        os.replace(exported, artifact)
+    return artifact
+
+
+def load_model(model_path, backend="pytorch", int8=False, int8_data=None):
+    """
+    YOLO model for the chosen backend; exported models keep the class names and the same
+    boxes / classes / track IDs interface as the PyTorch weights.
+    """
+    path = ensure_exported(model_path, backend, int8, int8_data)
+    return YOLO(path, task="detect") if backend != "pytorch" else YOLO(path)
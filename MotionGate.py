@@ -0,0 +1,60 @@
+import cv2
+
+
+class MotionGate:
+    """
+    Cheap motion pre-filter that decides whether a frame needs the detector at all.
+    Only a horizontal band around the crossing line is checked, on a downscaled, blurred
+    grayscale copy. The band is compared with the band of the last frame that was detected,
+    so slow movement still accumulates into a detection.
+    """
+
+    def __init__(self, crossing_y, margin=120, sensitivity=0.002, pixel_threshold=25, scale=0.25, max_skip=30):
+        self.crossing_y = crossing_y
+        self.margin = margin
+        self.sensitivity = sensitivity  # Fraction of band pixels that must change to count as motion
+        self.pixel_threshold = pixel_threshold  # Grey-level difference that marks a pixel as changed
+        self.scale = scale
+        self.max_skip = max_skip  # Detect at least this often so the tracker never goes stale
+
+        self.reference = None
+        self.skipped_in_a_row = 0
+        self.checked = 0
+        self.skipped = 0
+
+    def _band(self, frame):
+        height = frame.shape[0]
+        top = max(0, self.crossing_y - self.margin)
+        bottom = min(height, self.crossing_y + self.margin)
+        band = frame[top:bottom] if bottom > top else frame
+        small = cv2.resize(band, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def should_detect(self, frame):
+        """
+        True when the band changed enough since the last detected frame (or max_skip was reached).
+        """
+        self.checked += 1
+        band = self._band(frame)
+        if self.reference is None or self.skipped_in_a_row >= self.max_skip:
+            moving = True
+        else:
+            diff = cv2.absdiff(band, self.reference)
+            changed = cv2.countNonZero(cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)[1])
+            moving = changed >= self.sensitivity * diff.size
+
+        if moving:
+            self.reference = band
+            self.skipped_in_a_row = 0
+        else:
+            self.skipped_in_a_row += 1
+            self.skipped += 1
+        return moving
+
+    def stats(self):
+        return {
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "skip_ratio": round(self.skipped / self.checked, 3) if self.checked else 0.0,
+        }
@@ -0,0 +1,307 @@
+"""
+Multi-camera processing: one YOLO model serves several video streams.
+
+Usage:
+    python MultiStream.py cam1.mp4 cam2.mp4 cam3.mp4 --lanes lanes.json --batch-size 4
+
+Local video files stand in for live cameras. Pass one --lanes file shared by every stream,
+or one --lanes per stream in the same order as the sources.
+"""
+import argparse
+import logging
+import math
+import os
+import queue
+import threading
+import time
+
+import cv2
+from ultralytics.trackers.track import TRACKER_MAP
+from ultralytics.utils import IterableSimpleNamespace
+from ultralytics.utils.checks import check_yaml
+
+from Detections import Detections
+from EventLog import EventLog
+from EventStore import EventStore
+from FrameWriter import FrameWriter
+from Lane import load_calibration, load_lanes
+from ModelBackend import BACKENDS, load_model
+from Pipeline import STOP, Stage
+from TrackExport import EXPORT_FORMATS, TrackExporter
+from utils import StreamAnalyzer
+
+try:
+    from ultralytics.utils import YAML
+
+    def _load_yaml(path):
+        return YAML.load(path)
+except ImportError:  # Older ultralytics releases
+    from ultralytics.utils import yaml_load as _load_yaml
+
+
+def make_tracker(tracker_cfg="botsort.yaml", frame_rate=30):
+    """
+    Builds a standalone ultralytics tracker, the same one model.track uses by default.
+    """
+    cfg = IterableSimpleNamespace(**_load_yaml(check_yaml(tracker_cfg)))
+    return TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=frame_rate)
+
+
+class CameraStream:
+    """
+    Per-stream state: its decoder, tracker, lane analyzer, writer and throughput counters.
+    """
+
+    def __init__(self, index, source, lanes, output_dir, queue_size, tracker_cfg, events_db=None,
+                 export_format=None, calibration=None):
+        self.index = index
+        self.source = source
+        self.name = f"cam{index}_{os.path.splitext(os.path.basename(str(source)))[0]}"
+        self.cap = cv2.VideoCapture(source)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open video: {source}")
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        self.analyzer = StreamAnalyzer(lanes, name=self.name)
+        self.analyzer.fps = self.fps
+        self.analyzer.calibration = calibration
+        self.tracker = make_tracker(tracker_cfg, frame_rate=int(round(self.fps)))
+        self.writer = FrameWriter(os.path.join(output_dir, self.name, "output.mp4"), self.fps, (width, height))
+        self.event_log = EventLog(os.path.join(output_dir, self.name, "data.txt"))
+        self.analyzer.sinks.append(self.event_log)
+        if events_db is not None:
+            # Streams share one database; each writes through its own connection, tagged with the stream name
+            self.analyzer.sinks.append(EventStore(events_db, self.name, fps=self.fps))
+        if export_format is not None:
+            exporter = TrackExporter(os.path.join(output_dir, self.name), format=export_format)
+            self.analyzer.sinks.append(exporter)
+            self.analyzer.track_sinks.append(exporter)
+
+        self.frames = queue.Queue(maxsize=queue_size)  # Decoded frames waiting for the scheduler
+        self.results = queue.Queue(maxsize=queue_size)  # Tracked frames waiting to be annotated
+        self.finished = False  # Decoder reached the end of the source
+
+        self.frame_count = 0
+        self.annotated = 0
+        self.latency_total = 0.0  # Decode-to-annotated seconds, summed over frames
+        self.started = 0.0
+        self.ended = 0.0
+
+    def decode(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        self.frame_count += 1
+        return self.frame_count, frame, time.perf_counter()
+
+    def head_time(self):
+        """
+        Capture time of the oldest waiting frame, or None when nothing is waiting.
+        """
+        try:
+            item = self.frames.queue[0]
+        except IndexError:
+            return None
+        return None if item is STOP else item[2]
+
+    def fps_achieved(self):
+        elapsed = self.ended - self.started
+        return self.annotated / elapsed if elapsed > 0 else 0.0
+
+
+class MultiStreamProcessor:
+    """
+    Serves N streams with one model. A scheduler thread batches frames from all streams,
+    oldest frame first with a per-stream cap on each batch, so a high-FPS stream cannot keep
+    the others waiting. Detections are routed back to each stream's own tracker in frame order,
+    then annotated and encoded on per-stream threads.
+    """
+
+    def __init__(self, model_path='zabir.pt', batch_size=4, queue_size=8, tracker_cfg="botsort.yaml",
+                 backend="pytorch", int8=False):
+        self.model = load_model(model_path, backend, int8)
+        self.class_list = self.model.names
+        self.classes = [1, 2, 3, 5, 6, 7]
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.tracker_cfg = tracker_cfg
+        self.streams = []
+        self.abort = threading.Event()
+        self.batches = 0
+        self.elapsed = 0.0
+        self.error = None
+
+    def add_stream(self, source, lanes, output_dir="runs/multi", events_db=None, export_format=None,
+                   calibration=None):
+        stream = CameraStream(len(self.streams), source, lanes, output_dir, self.queue_size, self.tracker_cfg,
+                              events_db=events_db, export_format=export_format, calibration=calibration)
+        self.streams.append(stream)
+        return stream
+
+    def _pending(self):
+        return [s for s in self.streams if not s.finished]
+
+    def _next_batch(self):
+        """
+        Collects up to batch_size frames, always taking the oldest waiting frame next.
+        """
+        active = self._pending()
+        per_stream = max(1, math.ceil(self.batch_size / max(1, len(active))))
+        taken = {s.index: 0 for s in active}
+        batch = []
+
+        while len(batch) < self.batch_size:
+            ready = [s for s in active
+                     if not s.finished and taken[s.index] < per_stream and s.head_time() is not None]
+            if not ready:
+                # Block briefly for the first frame so the scheduler does not spin
+                if batch or not self._pending() or self.abort.is_set():
+                    break
+                time.sleep(0.002)
+                self._mark_finished()
+                continue
+            stream = min(ready, key=lambda s: s.head_time())
+            batch.append((stream, stream.frames.get()))
+            taken[stream.index] += 1
+
+        self._mark_finished()
+        return batch
+
+    def _mark_finished(self):
+        for stream in self.streams:
+            if not stream.finished and stream.frames.qsize() and stream.frames.queue[0] is STOP:
+                stream.frames.get()
+                stream.finished = True
+
+    def _schedule(self):
+        try:
+            while self._pending() and not self.abort.is_set():
+                batch = self._next_batch()
+                if not batch:
+                    continue
+
+                frames = [item[1] for _, item in batch]
+                results = self.model.predict(frames, classes=self.classes, verbose=False)
+                self.batches += 1
+
+                # Feed each stream's tracker in frame order and hand the frame to its annotator
+                for (stream, (frame_index, frame, captured)), result in zip(batch, results):
+                    tracks = stream.tracker.update(result.boxes.cpu().numpy(), result.orig_img)
+                    detections = Detections.from_tracks(tracks)
+                    if not self._put(stream.results, (frame_index, frame, captured, detections)):
+                        return
+        except Exception as e:
+            self.error = e
+            self.abort.set()
+        finally:
+            # After an abort the annotators stop on their own and may no longer drain their queues
+            for stream in self.streams:
+                if not self._put(stream.results, STOP):
+                    break
+
+    def _put(self, results, item):
+        # Like Stage._put: a failed annotate or encode stage sets abort and stops draining, so never block for good
+        while not self.abort.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _annotate(self, stream):
+        def work(item):
+            frame_index, frame, captured, detections = item
+            frame = stream.analyzer.draw_boxes(frame, detections.boxes, self.class_list, detections.class_indices,
+                                               identities=detections.track_ids)
+            for sink in stream.analyzer.sinks:
+                sink.poll()
+            stream.annotated += 1
+            stream.latency_total += time.perf_counter() - captured
+            stream.ended = time.perf_counter()
+            return frame
+        return work
+
+    def run(self):
+        """
+        Processes every stream to the end and writes each stream's video and event log.
+        """
+        self.error = None
+        threads = []
+        start = time.perf_counter()
+        for stream in self.streams:
+            stream.started = start
+            threads.append(Stage(f"decode-{stream.name}", stream.decode, outbox=stream.frames, abort=self.abort))
+            encode = Stage(f"encode-{stream.name}", stream.writer.encode, abort=self.abort,
+                           inbox=queue.Queue(maxsize=self.queue_size))
+            threads.append(Stage(f"annotate-{stream.name}", self._annotate(stream), inbox=stream.results,
+                                 outbox=encode.inbox, abort=self.abort))
+            threads.append(encode)
+        threads.append(threading.Thread(target=self._schedule, name="scheduler", daemon=True))
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.perf_counter() - start
+
+        closed = []
+        for stream in self.streams:
+            stream.cap.release()
+            stream.writer.finalize()
+            closed.append(stream.analyzer.close_sinks())
+
+        errors = [self.error] + [t.error for t in threads if isinstance(t, Stage)] + closed
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def report(self):
+        total = sum(s.annotated for s in self.streams)
+        lines = [f"{len(self.streams)} streams, {self.batches} batches: "
+                 f"{total / self.elapsed if self.elapsed > 0 else 0:.2f} FPS total over {self.elapsed:.2f}s"]
+        for stream in self.streams:
+            latency = stream.latency_total / stream.annotated * 1000 if stream.annotated else 0.0
+            lines.append(f"  {stream.name:<24} {stream.annotated:>7} frames  {stream.fps_achieved():>8.2f} FPS  "
+                         f"{latency:>8.1f} ms mean latency")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+", help="Video files (or camera URLs) to serve")
+    parser.add_argument("--lanes", action="append", required=True,
+                        help="Lane configuration; give once for all streams or once per stream")
+    parser.add_argument("--model", default="zabir.pt")
+    parser.add_argument("--output", default="runs/multi")
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--backend", choices=BACKENDS, default="pytorch")
+    parser.add_argument("--int8", action="store_true", help="INT8-quantized model (openvino backend only)")
+    parser.add_argument("--events-db", default=None, help="SQLite event store shared by all streams")
+    parser.add_argument("--export-tracks", choices=EXPORT_FORMATS, default=None,
+                        help="Also write each stream's per-frame tracks and events as columnar files (needs pyarrow)")
+    parser.add_argument("--log-level", choices=("DEBUG", "INFO", "WARNING", "ERROR"), default="INFO",
+                        help="DEBUG adds per-frame progress and crossing diagnostics")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level, format="%(message)s")
+
+    if len(args.lanes) not in (1, len(args.sources)):
+        parser.error("--lanes must be given once or once per source")
+
+    processor = MultiStreamProcessor(args.model, batch_size=args.batch_size, queue_size=args.queue_size,
+                                     backend=args.backend, int8=args.int8)
+    for i, source in enumerate(args.sources):
+        lanes_path = args.lanes[i] if len(args.lanes) > 1 else args.lanes[0]
+        processor.add_stream(source, load_lanes(lanes_path), args.output, events_db=args.events_db,
+                             export_format=args.export_tracks, calibration=load_calibration(lanes_path))
+
+    processor.run()
+    print(processor.report())
+
+
+if __name__ == "__main__":
+    main()
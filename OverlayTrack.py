@@ -0,0 +1,202 @@
+import json
+import os
+from dataclasses import asdict
+
+import numpy as np
+
+from Lane import Lane
+
+OVERLAY_SUFFIX = ".overlay.npz"
+TRAIL_LENGTH = 64  # Points of a trail, like StreamAnalyzer.data_deque
+
+
+def overlay_path(video_path):
+    """
+    Sidecar overlay file that belongs to a video: output.mp4 -> output.overlay.npz.
+    """
+    return os.path.splitext(video_path)[0] + OVERLAY_SUFFIX
+
+
+class OverlayTrackWriter:
+    """
+    Records what draw_boxes would burn into the video, so a player can draw it over the original
+    file instead: every frame's boxes, track IDs and classes, the lane geometry and every crossing
+    (which make lanes blink and drive the count panels). Registered on a StreamAnalyzer as a
+    track sink and a crossing sink, so repeated crossings of a track are recorded like the panels
+    count them; everything is kept as small integer arrays and written as one compressed .npz on close.
+    """
+
+    def __init__(self, path, lanes, fps=None):
+        self.path = path
+        self.lanes = [asdict(lane) for lane in lanes]
+        self.fps = fps or 30
+        self.names = {}
+        self.rows = []  # (frame, boxes, track IDs, classes) per frame, appended whole for snapshot()
+        self.box_count = 0
+        self.events = []  # (frame, lane, direction, class name) of every crossing
+        self.closed = False
+
+    def write_frame(self, frame_index, ids, class_ids, boxes, centers, names):
+        if not self.names:
+            self.names = {int(k): v for k, v in names.items()}
+        self.rows.append((frame_index, np.asarray(boxes).astype(np.int16), np.asarray(ids, dtype=np.int32),
+                          np.asarray(class_ids, dtype=np.int16)))
+        self.box_count += len(ids)
+
+    def write_crossing(self, vehicle):
+        self.events.append((vehicle.frame, vehicle.lane, vehicle.direction, vehicle.name))
+
+    def arrays(self):
+        """
+        (meta, arrays) of everything recorded so far, as stored in the sidecar file. Safe to call
+        from another thread while frames are still being written: it sees a prefix of the run,
+        whole frames only, since every frame is appended as one tuple.
+        """
+        rows, events = self.rows[:], self.events[:]
+        frames = [row[0] for row in rows]
+        boxes, ids, classes = [row[1] for row in rows], [row[2] for row in rows], [row[3] for row in rows]
+        event_classes = list(dict.fromkeys(name for _, _, _, name in events))
+        meta = {"fps": self.fps, "lanes": self.lanes, "names": self.names, "event_classes": event_classes}
+        return meta, {
+            "frames": np.array(frames, dtype=np.int32),
+            "counts": np.array([len(row_ids) for row_ids in ids], dtype=np.int32),
+            "boxes": np.concatenate(boxes) if boxes else np.empty((0, 4), np.int16),
+            "ids": np.concatenate(ids) if ids else np.empty(0, np.int32),
+            "classes": np.concatenate(classes) if classes else np.empty(0, np.int16),
+            "event_frames": np.array([e[0] for e in events], dtype=np.int32),
+            "event_lanes": np.array([e[1] for e in events], dtype=np.int16),
+            "event_in": np.array([e[2] == "in" for e in events], dtype=bool),
+            "event_classes": np.array([event_classes.index(e[3]) for e in events], dtype=np.int16),
+        }
+
+    def snapshot(self):
+        """
+        OverlayTrack of the frames processed so far, for playing back a run that is still going.
+        """
+        return OverlayTrack(*self.arrays())
+
+    def close(self):
+        """
+        Writes the sidecar file; safe to call more than once.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        meta, arrays = self.arrays()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        partial = self.path + ".partial"
+        with open(partial, "wb") as file:
+            np.savez_compressed(file, meta=np.array(json.dumps(meta)), **arrays)
+        os.replace(partial, self.path)
+
+    def stats(self):
+        return {"frames": len(self.rows), "boxes": self.box_count, "events": len(self.events)}
+
+
+class OverlayTrack:
+    """
+    A sidecar overlay (see OverlayTrack.load) for playback. Rows are indexed by frame on load, so
+    the boxes, trails, blinking lanes and counts of any frame are found without scanning: seeking
+    costs the same as playing on.
+    """
+
+    def __init__(self, meta, arrays):
+        frames, counts = arrays["frames"], arrays["counts"]
+        self.boxes = arrays["boxes"].astype(np.int32)
+        self.ids = arrays["ids"]
+        self.classes = arrays["classes"]
+        event_frames = arrays["event_frames"]
+        event_lanes = arrays["event_lanes"]
+        event_in = arrays["event_in"]
+        event_classes = arrays["event_classes"]
+
+        self.fps = meta["fps"]
+        self.lanes = [Lane(**{**entry, "color": tuple(entry["color"])}) for entry in meta["lanes"]]
+        self.names = {int(k): v for k, v in meta["names"].items()}
+        self.last_frame = int(frames.max()) if len(frames) else 0
+
+        # Rows of frame f are offsets[f]:offsets[f + 1]; frames without detections are empty
+        per_frame = np.zeros(self.last_frame + 1, dtype=np.int64)
+        per_frame[frames] = counts
+        self.offsets = np.concatenate([[0], np.cumsum(per_frame)])
+
+        # Trails: rows sorted by (track ID, frame); a trail runs back while the ID was seen on every frame
+        row_frames = np.repeat(frames, counts)
+        self.order = np.lexsort((row_frames, self.ids))
+        self.rank = np.empty_like(self.order)
+        self.rank[self.order] = np.arange(len(self.order))
+        sorted_ids, sorted_frames = self.ids[self.order], row_frames[self.order]
+        breaks = np.ones(len(self.order), dtype=bool)
+        breaks[1:] = (sorted_ids[1:] != sorted_ids[:-1]) | (sorted_frames[1:] != sorted_frames[:-1] + 1)
+        self.run_start = np.maximum.accumulate(np.where(breaks, np.arange(len(self.order)), 0))
+        self.centers = np.stack([(self.boxes[:, 0] + self.boxes[:, 2]) // 2, self.boxes[:, 3]], axis=1)
+
+        # Crossing events in frame order, with running totals per (direction, class) after each one
+        order = np.argsort(event_frames, kind="stable")
+        self.event_frames = event_frames[order]
+        self.event_lanes = event_lanes[order]
+        classes = meta["event_classes"]
+        keys = [("in" if e_in else "out", classes[c]) for e_in, c in zip(event_in[order], event_classes[order])]
+        self.count_keys = list(dict.fromkeys(keys))  # First-seen order, like the counter's dicts
+        columns = {key: i for i, key in enumerate(self.count_keys)}
+        steps = np.zeros((len(keys) + 1, len(self.count_keys)), dtype=np.int32)
+        steps[np.arange(1, len(keys) + 1), [columns[key] for key in keys]] = 1
+        self.totals = np.cumsum(steps, axis=0)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a sidecar file written by OverlayTrackWriter.
+        """
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(meta, {name: data[name] for name in data.files if name != "meta"})
+
+    def frame_at(self, position_ms):
+        """
+        Frame index (1-based, like the processor's) shown at a player position in milliseconds.
+        """
+        return int(position_ms * self.fps / 1000) + 1
+
+    def frame(self, frame_index):
+        """
+        [(box, track ID, class ID, class name)] of one frame, box as (x1, y1, x2, y2).
+        """
+        if not 0 <= frame_index <= self.last_frame:
+            return []
+        rows = range(self.offsets[frame_index], self.offsets[frame_index + 1])
+        return [(tuple(self.boxes[i].tolist()), int(self.ids[i]), int(self.classes[i]),
+                 self.names.get(int(self.classes[i]), str(self.classes[i]))) for i in rows]
+
+    def trails(self, frame_index, length=TRAIL_LENGTH):
+        """
+        One trail per box of the frame, newest point first, as draw_trail draws them.
+        """
+        if not 0 <= frame_index <= self.last_frame:
+            return []
+        trails = []
+        for row in range(self.offsets[frame_index], self.offsets[frame_index + 1]):
+            position = self.rank[row]
+            first = max(self.run_start[position], position - length + 1)
+            trails.append(self.centers[self.order[first:position + 1][::-1]])
+        return trails
+
+    def blinking(self, frame_index):
+        """
+        0-based indices of the lanes a vehicle crossed on this frame.
+        """
+        start = np.searchsorted(self.event_frames, frame_index, side="left")
+        end = np.searchsorted(self.event_frames, frame_index, side="right")
+        return set((self.event_lanes[start:end] - 1).tolist())
+
+    def counts(self, frame_index):
+        """
+        ({class: count} in, {class: count} out) up to and including this frame.
+        """
+        totals = self.totals[np.searchsorted(self.event_frames, frame_index, side="right")]
+        vehicle_in, vehicle_out = {}, {}
+        for (direction, name), count in zip(self.count_keys, totals.tolist()):
+            if count:
+                (vehicle_in if direction == "in" else vehicle_out)[name] = count
+        return vehicle_in, vehicle_out
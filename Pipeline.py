@@ -0,0 +1,195 @@
+import queue
+import threading
+import time
+
+STOP = object()  # Sentinel passed downstream when a stage runs out of input
+
+
+class Stage(threading.Thread):
+    """
+    One stage of a Pipeline. A source stage (no inbox) calls work() until it returns None;
+    every other stage calls work(item) for each item from its inbox and forwards the result.
+    Results of None are not forwarded, which lets sink stages simply return nothing.
+    With batch_size > 1 the stage collects up to batch_size items, calls work(items) once and
+    forwards each element of the returned list in order; a short final batch is flushed at the end.
+    With many=True work(item) returns a list of zero or more results, which lets a stage hold
+    items back and release them later; flush() is then called at end of input for the remainder.
+    """
+
+    def __init__(self, name, work, inbox=None, outbox=None, abort=None, batch_size=1, many=False, flush=None):
+        super().__init__(name=name, daemon=True)
+        self.work = work
+        self.batch_size = batch_size
+        self.many = many
+        self.flush = flush
+        self.inbox = inbox
+        self.outbox = outbox
+        self.abort = abort or threading.Event()
+        self.error = None
+
+        self.items = 0
+        self.busy_time = 0.0  # Seconds spent inside work()
+        self.wall_time = 0.0
+
+    def _put(self, item):
+        # Blocking put that still notices an abort while the downstream queue is full
+        while not self.abort.is_set():
+            try:
+                self.outbox.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self):
+        while not self.abort.is_set():
+            try:
+                return self.inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return STOP
+
+    def _get_batch(self):
+        # Waits for a full batch, or returns what is left once the input runs out
+        batch = []
+        while len(batch) < self.batch_size:
+            item = self._get()
+            if item is STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _call(self, *args):
+        start = time.perf_counter()
+        result = self.work(*args)
+        self.busy_time += time.perf_counter() - start
+        return result
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            if self.batch_size > 1:
+                self._run_batched()
+                return
+
+            while not self.abort.is_set():
+                if self.inbox is None:
+                    result = self._call()
+                    if result is None:
+                        break
+                else:
+                    item = self._get()
+                    if item is STOP:
+                        if self.flush is not None:
+                            self._forward(self.flush())
+                        break
+                    result = self._call(item)
+
+                self.items += 1
+                if not self._forward(result if self.many else [result]):
+                    break
+        except Exception as e:
+            self.error = e
+            self.abort.set()
+        finally:
+            self.wall_time = time.perf_counter() - started
+            if self.outbox is not None:
+                self._put(STOP)
+
+    def _forward(self, results):
+        for result in results:
+            if result is not None and self.outbox is not None:
+                if not self._put(result):
+                    return False
+        return True
+
+    def _run_batched(self):
+        while not self.abort.is_set():
+            batch, done = self._get_batch()
+            if batch:
+                results = self._call(batch)
+                self.items += len(batch)
+                if not self._forward(results):
+                    return
+            if done:
+                return
+
+    def stats(self):
+        return {
+            "items": self.items,
+            "busy_s": round(self.busy_time, 3),
+            "fps": round(self.items / self.busy_time, 2) if self.busy_time > 0 else 0.0,
+        }
+
+
+class Pipeline:
+    """
+    A chain of Stage threads joined by bounded queues. A full queue blocks the stage feeding it,
+    so a slow stage applies backpressure instead of letting frames pile up in memory.
+    """
+
+    def __init__(self, queue_size=8):
+        self.queue_size = queue_size
+        self.stages = []
+        self.abort = threading.Event()
+        self.elapsed = 0.0
+
+    def add_stage(self, name, work, batch_size=1, many=False, flush=None):
+        """
+        Appends a stage. The first stage added is the source and is called without arguments.
+        """
+        inbox = None
+        if self.stages:
+            inbox = queue.Queue(maxsize=max(self.queue_size, batch_size))
+            self.stages[-1].outbox = inbox
+        self.stages.append(Stage(name, work, inbox=inbox, abort=self.abort, batch_size=batch_size,
+                                 many=many, flush=flush))
+        return self
+
+    def stop(self):
+        """
+        Asks every stage to stop as soon as possible.
+        """
+        self.abort.set()
+
+    def run(self):
+        """
+        Starts all stages, waits for the last one to finish and re-raises the first stage error.
+        """
+        start = time.perf_counter()
+        for stage in self.stages:
+            stage.start()
+        for stage in self.stages:
+            stage.join()
+        self.elapsed = time.perf_counter() - start
+
+        for stage in self.stages:
+            if stage.error is not None:
+                raise stage.error
+
+    def fps(self):
+        """
+        End-to-end throughput, measured on items leaving the last stage.
+        """
+        if not self.stages or self.elapsed <= 0:
+            return 0.0
+        return self.stages[-1].items / self.elapsed
+
+    def stats(self):
+        return {stage.name: stage.stats() for stage in self.stages}
+
+    def bottleneck(self):
+        """
+        Name of the stage with the lowest throughput while busy.
+        """
+        busy = [stage for stage in self.stages if stage.busy_time > 0]
+        if not busy:
+            return None
+        return min(busy, key=lambda stage: stage.items / stage.busy_time).name
+
+    def report(self):
+        lines = [f"Pipeline: {self.fps():.2f} FPS end-to-end over {self.elapsed:.2f}s"]
+        for name, stats in self.stats().items():
+            lines.append(f"  {name:<10} {stats['items']:>7} items  {stats['busy_s']:>8.2f}s busy  {stats['fps']:>8.2f} FPS")
+        lines.append(f"  bottleneck: {self.bottleneck()}")
+        return "\n".join(lines)
@@ -1,122 +1,44 @@
-import cv2
-import os
-from collections import defaultdict
-from PyQt5.QtCore import pyqtSignal, QObject, QThread
-from ultralytics import YOLO
-from utils import draw_boxes, write_to_file
+import logging
 
+from PyQt5.QtCore import pyqtSignal, QThread
+from VideoProcessor import VideoProcessor
 
-class Predictor(QThread):
+logger = logging.getLogger(__name__)
+
+
+class Predictor(VideoProcessor, QThread):
     """
-    A class for processing videos using YOLO for object detection and tracking.
-    Stores processed frames in memory and allows saving the annotated video.
+    Runs a VideoProcessor on a QThread and reports progress to the GUI through signals.
+    progress_updated carries a Progress at most every progress_interval seconds, so a fast run
+    cannot flood the GUI's event loop. Output is written in segments by default, since
+    segment_ready is how the GUI plays the part of a run processed so far.
     """
-    update_frame = pyqtSignal()
+    progress_updated = pyqtSignal(object)
     completed = pyqtSignal()
-    def __init__(self, model_path='zabir.pt'):
+    segment_ready = pyqtSignal(str)
+
+    def __init__(self, model_path='zabir.pt', backend="pytorch", int8=False):
+        super().__init__(model_path, backend=backend, int8=int8)
+        self.segment_seconds = 10
+
+    def can_play_partial(self):
         """
-        Initializes the YOLO model and sets up storage for processed frames.
+        Whether the part of a run processed so far can be played while it continues: from the
+        overlay track snapshot, or from finished segments (a single output file is only playable at the end).
         """
-        super().__init__()
-        self.model = YOLO(model_path)
-        print(self.model.names)
-        self.class_list = self.model.names
-        self.class_counts = defaultdict(int)
-        self.crossed_ids = set()
-
-        self.video_frames = []  # Stores annotated frames
-        self.video_properties = {}  # Stores video properties (width, height, FPS, total frames)
-        self.total_frames = 0
-        self.current_frame = 0
-        self.source = 0
+        return bool(self.overlay_track and not self.live) or bool(self.stream_output and self.segment_seconds)
 
     def run(self):
         if self.source != 0:
             self.predict()
         else:
-            print("Source not defined")
-
-    def process_frame(self, frame):
-        """
-        Annotates a single frame using YOLO tracking and stores it.
-        """
-        # Run YOLO tracking
-        results = self.model.track(frame, persist=True, classes=[1, 2, 3, 5, 6, 7])
-
-        # Ensure results are not empty
-        if results[0].boxes.data is not None:
-            boxes = results[0].boxes.xyxy.cpu()
-            track_ids = results[0].boxes.id
-            track_ids = track_ids.int().cpu().tolist() if track_ids is not None else [None] * len(boxes)
-            class_indices = results[0].boxes.cls.int().cpu().tolist()
-
-            # Draw bounding boxes and tracking info
-            frame = draw_boxes(frame, boxes, self.class_list, class_indices, identities=track_ids)
-
-        # Store the processed frame
-        self.video_frames.append(frame)
-
-    def predict(self):
-        """
-        Reads frames from a video file, processes them, and stores annotated frames in memory.
-        """
-        cap = cv2.VideoCapture(self.source)
-
-        if not cap.isOpened():
-            print("Error: Could not open video.")
-            return
-
-        # Store video properties
-        self.video_properties = {
-            "frame_width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
-            "frame_height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
-            "fps": cap.get(cv2.CAP_PROP_FPS),
-            "total_frames": int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        }
-        self.total_frames = self.video_properties["total_frames"]
-
-        print(
-            f"Total frames: {self.total_frames}, Resolution: {self.video_properties['frame_width']}x{self.video_properties['frame_height']}, FPS: {self.video_properties['fps']}")
-
-        frame_count = 0
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            frame_count += 1
-
-            self.current_frame = frame_count  # Update current frame count
-            self.update_frame.emit()
-            print(f"Processing frame: {frame_count}/{self.total_frames}")
-
-            self.process_frame(frame)  # Process and store the frame
-
-
-        cap.release()
-        self.save_video()
-        print("Video processing completed. Frames stored in memory.")
-
-
-    def save_video(self, output_path="runs/detect/output.mp4"):
-        """
-        Saves the processed frames as a video file.
-        """
-        if not self.video_frames:
-            print("No frames to save!")
-            return
-
-        # Create output directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            logger.warning("Source not defined")
 
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_path, fourcc, self.video_properties["fps"],
-                              (self.video_properties["frame_width"], self.video_properties["frame_height"]))
+    def on_progress(self, progress):
+        self.progress_updated.emit(progress)
 
-        for frame in self.video_frames:
-            out.write(frame)
+    def on_segment(self, path):
+        self.segment_ready.emit(path)
 
-        out.release()
-        print(f"Annotated video saved at: {output_path}")
-        write_to_file()
+    def on_completed(self):
         self.completed.emit()
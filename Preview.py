@@ -0,0 +1,71 @@
+import threading
+import time
+
+import cv2
+
+
+class LatestFrame:
+    """
+    Single-slot buffer holding the newest annotated frame for a live preview.
+    The processing side publishes at most max_fps frames per second, downscaled to fit size
+    (the preview widget's, set by the GUI); a frame the GUI has not taken yet is simply
+    replaced, so a slow GUI costs dropped preview frames and never a growing queue.
+    """
+
+    def __init__(self, max_fps=10, size=None):
+        self.interval = 1.0 / max_fps if max_fps else 0.0
+        self.size = size  # (width, height) the preview is shown at; None keeps the frame size
+        self.lock = threading.Lock()
+        self.slot = None
+        self.next_time = 0.0
+        self.published = 0
+        self.dropped = 0  # Replaced before the GUI took them
+
+    def due(self):
+        """
+        Whether the next published frame would be kept; lets the caller skip preparing the others.
+        """
+        return time.perf_counter() >= self.next_time
+
+    def publish(self, frame_index, frame):
+        """
+        Offers a frame; returns False if it was rate-limited away. Called from the processing thread.
+        """
+        now = time.perf_counter()
+        if now < self.next_time:
+            return False
+        self.next_time = now + self.interval
+
+        size = self.size
+        height, width = frame.shape[:2]
+        if size is not None and (width > size[0] or height > size[1]):
+            scale = min(size[0] / width, size[1] / height)
+            frame = cv2.resize(frame, (max(1, int(width * scale)), max(1, int(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+        else:
+            frame = frame.copy()  # The processing loop keeps using its own frame
+
+        with self.lock:
+            if self.slot is not None:
+                self.dropped += 1
+            self.slot = (frame_index, frame)
+            self.published += 1
+        return True
+
+    def take(self):
+        """
+        The newest (frame_index, frame), or None if nothing new was published since the last take.
+        """
+        with self.lock:
+            item, self.slot = self.slot, None
+        return item
+
+    def reset(self):
+        with self.lock:
+            self.slot = None
+        self.next_time = 0.0
+        self.published = 0
+        self.dropped = 0
+
+    def stats(self):
+        return {"published": self.published, "dropped": self.dropped}
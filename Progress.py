@@ -0,0 +1,80 @@
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class Progress:
+    """
+    One progress report: frames done, total (0 when unknown, e.g. live streams), speed and ETA.
+    """
+    frame: int
+    total: int
+    fps: float
+    elapsed: float  # Seconds since the run started
+    eta: float = None  # Seconds left, None when the total is unknown
+
+    def __str__(self):
+        text = f"Frame: {self.frame}/{self.total}" if self.total else f"Frame: {self.frame}"
+        text += f"  {self.fps:.1f} FPS"
+        if self.eta is not None:
+            minutes, seconds = divmod(int(self.eta), 60)
+            text += f"  ETA {minutes}:{seconds:02d}"
+        return text
+
+
+class ProgressTracker:
+    """
+    Coalesces per-frame progress into reports at most every interval seconds, so the frame
+    loop pays one clock read per frame and listeners (a Qt signal, a log line) see a fixed
+    rate however fast frames go. FPS is smoothed over the recent reports.
+    """
+
+    def __init__(self, interval=0.25, smoothing=0.5):
+        self.interval = interval
+        self.smoothing = smoothing  # Weight of the newest interval's rate in the FPS estimate
+        self.total = 0
+        self.start_time = 0.0
+        self.next_time = 0.0
+        self.last_time = 0.0
+        self.last_frame = 0
+        self.fps = 0.0
+
+    def start(self, total_frames=0):
+        now = time.perf_counter()
+        self.total = total_frames
+        self.start_time = self.last_time = now
+        self.next_time = now + self.interval
+        self.last_frame = 0
+        self.fps = 0.0
+
+    def update(self, frame):
+        """
+        Records that frame is done; returns a Progress when a report is due, otherwise None.
+        """
+        now = time.perf_counter()
+        if now < self.next_time:
+            return None
+        return self._report(frame, now)
+
+    def finish(self, frame):
+        """
+        Final report of the run, always returned, with the average FPS of the whole run.
+        """
+        now = time.perf_counter()
+        progress = self._report(frame, now)
+        if now > self.start_time:
+            progress.fps = frame / (now - self.start_time)
+        return progress
+
+    def _report(self, frame, now):
+        elapsed = now - self.last_time
+        if elapsed > 0 and frame > self.last_frame:
+            rate = (frame - self.last_frame) / elapsed
+            self.fps = rate if self.fps == 0 else self.smoothing * rate + (1 - self.smoothing) * self.fps
+        self.last_time, self.last_frame = now, frame
+        self.next_time = now + self.interval
+
+        eta = None
+        if self.total and self.fps > 0:
+            eta = max(0, self.total - frame) / self.fps
+        return Progress(frame, self.total, self.fps, now - self.start_time, eta)
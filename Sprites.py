@@ -0,0 +1,119 @@
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class Sprite:
+    """
+    A pre-rendered graphic as a premultiplied BGRA image, built from the same drawing done once
+    on a black and once on a white canvas: black holds colour * alpha, white - black is
+    255 - alpha. Drawing blends it onto the frame, clipped to the frame edges.
+    """
+
+    BLEND_AREA = 16384  # Up to this many pixels the whole sprite is blended; larger ones copy opaque pixels
+
+    def __init__(self, black, white):
+        inverse = white - black  # Per channel 255 - alpha: 255 where nothing was drawn, 0 where opaque
+        self.bgra = np.dstack([black, (255 - inverse.astype(np.uint16).sum(axis=2) // 3).astype(np.uint8)])
+        self.color = np.ascontiguousarray(black)  # BGR plane of bgra, contiguous for OpenCV
+        self.inverse = np.ascontiguousarray(inverse)  # Per-channel coverage blends a little more exactly
+        alpha = self.bgra[..., 3]
+        self.height, self.width = alpha.shape
+        self.opaque = (alpha == 255).view(np.uint8)
+        self.edges = np.nonzero((alpha > 0) & (alpha < 255))
+        self.edge_color = black[self.edges].astype(np.uint16)
+        self.edge_inverse = inverse[self.edges].astype(np.uint16)
+
+    def draw(self, img, x, y):
+        """
+        Composites the sprite with its top-left corner at (x, y) of img.
+        """
+        img_height, img_width = img.shape[:2]
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + self.width, img_width), min(y + self.height, img_height)
+        if x1 >= x2 or y1 >= y2:
+            return
+        region = img[y1:y2, x1:x2]
+        sy, sx = slice(y1 - y, y2 - y), slice(x1 - x, x2 - x)
+
+        if self.width * self.height <= self.BLEND_AREA:
+            # Small sprites (label badges): one OpenCV blend of every pixel is cheapest
+            cv2.add(cv2.multiply(region, self.inverse[sy, sx], scale=1 / 255), self.color[sy, sx], dst=region)
+            return
+
+        # Large, mostly opaque sprites (panels): masked copy, then blend the few anti-aliased pixels
+        rows, cols = self.edges
+        edge_color, edge_inverse = self.edge_color, self.edge_inverse
+        if (x2 - x1, y2 - y1) != (self.width, self.height):
+            # Partly outside the frame: keep only the visible edge pixels
+            visible = (rows >= sy.start) & (rows < sy.stop) & (cols >= sx.start) & (cols < sx.stop)
+            rows, cols = rows[visible] - sy.start, cols[visible] - sx.start
+            edge_color, edge_inverse = edge_color[visible], edge_inverse[visible]
+        if len(rows):
+            region[rows, cols] = edge_color + (region[rows, cols] * edge_inverse + 127) // 255
+        cv2.copyTo(self.color[sy, sx], self.opaque[sy, sx], region)
+
+
+class LabelSpriteCache:
+    """
+    LRU cache of rendered UI_box label badges (border shape plus text), keyed by
+    (text, color, line thickness). A track's label never changes, so after its first frame
+    every badge is one Sprite.draw instead of ~20 OpenCV drawing calls.
+    """
+
+    MARGIN = 10  # Canvas padding around the badge, cropped away after rendering
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, label, color, line_thickness, render):
+        """
+        Sprite and (dx, dy) offset from the box corner for a label; render(img, origin) draws
+        the badge with the box corner at origin and is only called on a miss.
+        """
+        key = (label, tuple(color), line_thickness)
+        entry = self.sprites.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = self._render(label, line_thickness, render)
+        self.sprites[key] = entry
+        if len(self.sprites) > self.capacity:
+            self.sprites.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def _render(self, label, line_thickness, render):
+        tf = max(line_thickness - 1, 1)
+        text_width, text_height = cv2.getTextSize(label, 0, fontScale=line_thickness / 3, thickness=tf)[0]
+        margin = self.MARGIN
+        origin = (margin, text_height + 3 + margin)
+        shape = (text_height + 6 + 2 * margin, text_width + 2 * margin, 3)
+        black, white = np.zeros(shape, dtype=np.uint8), np.full(shape, 255, dtype=np.uint8)
+        render(black, origin)
+        render(white, origin)
+
+        # Crop to the drawn pixels so compositing touches as few pixels as possible
+        drawn = (black != white).any(axis=2)
+        rows, cols = np.flatnonzero(drawn.any(axis=1)), np.flatnonzero(drawn.any(axis=0))
+        y1, y2, x1, x2 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+        sprite = Sprite(black[y1:y2, x1:x2], white[y1:y2, x1:x2])
+        return sprite, (x1 - origin[0], y1 - origin[1])
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "sprites": len(self.sprites),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,175 @@
+import os
+import queue
+import threading
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: only needed for columnar export
+    pa = pq = None
+
+EXPORT_FORMATS = ("parquet", "arrow")
+
+
+class TrackExporter(threading.Thread):
+    """
+    Streams every tracked box of every frame, and the crossing events, into columnar files:
+    <export_dir>/tracks.<ext> and <export_dir>/events.<ext>, as Parquet or as an Arrow IPC file
+    (which can be memory-mapped with pyarrow.memory_map). Rows are grouped by frame range, one
+    row group (record batch) per frames_per_group frames, so readers can skip whole ranges.
+
+    Registered on a StreamAnalyzer both as an event sink and as a track sink. The analyzer only
+    queues references to the arrays it already built; converting and writing happens on this
+    thread. The queue is bounded, so a writer that falls far behind applies backpressure
+    instead of growing memory.
+    """
+
+    def __init__(self, export_dir, format="parquet", frames_per_group=300, max_queue=256):
+        if pa is None:
+            raise ImportError("Columnar export needs pyarrow: pip install pyarrow")
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {format!r}, expected one of {EXPORT_FORMATS}")
+        super().__init__(name="track-export", daemon=True)
+        self.export_dir = export_dir
+        self.format = format
+        self.frames_per_group = frames_per_group
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.error = None
+        self.closed = False
+
+        self.class_names = None  # Fixed dictionary of the class column, from the first frame's names
+        self.class_lookup = None
+        self.group = None  # Frame range (frame // frames_per_group) being buffered
+        self.track_chunks = []
+        self.event_rows = []
+        self.writers = {}
+        self.track_rows = 0
+        self.events = 0
+        self.row_groups = 0
+
+        os.makedirs(export_dir, exist_ok=True)
+        self.start()
+
+    def write_frame(self, frame_index, ids, class_ids, boxes, centers, names):
+        """
+        Queues the tracked boxes of one frame; boxes are (N, 4) x1, y1, x2, y2 and centers (N, 2).
+        """
+        self.queue.put(("frame", (frame_index, ids, class_ids, boxes, centers, names)))
+
+    def write(self, vehicle):
+        self.queue.put(("event", (vehicle.frame, vehicle.id, vehicle.direction, vehicle.lane, vehicle.name,
+                                  vehicle.speed, vehicle.recorded_at)))
+
+    def poll(self):
+        pass  # Everything is written on the export thread
+
+    def close(self):
+        """
+        Writes the last row group, closes the files and waits for the thread. Re-raises a write error.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.join()
+        if self.error is not None:
+            raise self.error
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if self.error is not None:
+                continue  # Keep draining so producers never block on a dead writer
+            try:
+                kind, record = item
+                if kind == "frame":
+                    self._add_frame(*record)
+                else:
+                    self._add_event(record)
+            except Exception as e:
+                self.error = e
+        try:
+            if self.error is None:
+                self._flush_group()
+        except Exception as e:
+            self.error = e
+        finally:
+            for writer in self.writers.values():
+                writer.close()
+
+    def _roll(self, frame_index):
+        group = frame_index // self.frames_per_group
+        if self.group is not None and group != self.group:
+            self._flush_group()
+        self.group = group
+
+    def _add_frame(self, frame_index, ids, class_ids, boxes, centers, names):
+        if self.class_names is None:
+            keys = sorted(names) if isinstance(names, dict) else list(range(len(names)))
+            self.class_names = pa.array([str(names[k]) for k in keys], pa.string())
+            # Class ID -> position in class_names
+            self.class_lookup = np.zeros(max(keys) + 1, dtype=np.int32)
+            self.class_lookup[keys] = np.arange(len(keys), dtype=np.int32)
+        self._roll(frame_index)
+        if len(boxes):
+            class_ids = np.asarray(class_ids).astype(np.int64)
+            self.track_chunks.append((np.full(len(boxes), frame_index, dtype=np.int64), np.asarray(ids, np.int64),
+                                      class_ids, boxes, centers))
+
+    def _add_event(self, record):
+        self._roll(record[0])
+        self.event_rows.append(record)
+
+    def _write(self, name, table):
+        if name not in self.writers:
+            path = os.path.join(self.export_dir, f"{name}.{self.format}")
+            if self.format == "parquet":
+                self.writers[name] = pq.ParquetWriter(path, table.schema, compression="zstd")
+            else:
+                self.writers[name] = pa.ipc.new_file(path, table.schema)
+        if self.format == "parquet":
+            self.writers[name].write_table(table, row_group_size=len(table))
+        else:
+            self.writers[name].write_table(table, max_chunksize=len(table))
+        self.row_groups += 1
+
+    def _flush_group(self):
+        if self.track_chunks:
+            frames, ids, class_ids, boxes, centers = (np.concatenate(column) for column in zip(*self.track_chunks))
+            boxes, centers = boxes.astype(np.int32), centers.astype(np.int32)
+            positions = self.class_lookup[class_ids]
+            self._write("tracks", pa.table({
+                "frame": frames,
+                "track_id": ids,
+                "class_id": class_ids.astype(np.int16),
+                "class": pa.DictionaryArray.from_arrays(pa.array(positions), self.class_names),
+                "x1": boxes[:, 0], "y1": boxes[:, 1], "x2": boxes[:, 2], "y2": boxes[:, 3],
+                "cx": centers[:, 0], "cy": centers[:, 1],
+            }))
+            self.track_rows += len(frames)
+            self.track_chunks = []
+        if self.event_rows:
+            frame, track_id, direction, lane, name, speed, recorded_at = zip(*self.event_rows)
+            self._write("events", pa.table({
+                "frame": pa.array(frame, pa.int64()),
+                "track_id": pa.array(track_id, pa.int64()),
+                "direction": pa.array(direction, pa.string()),
+                "lane": pa.array(lane, pa.int16()),
+                "class": pa.array(name, pa.string()),
+                "speed": pa.array(speed, pa.float32()),
+                "recorded_at": pa.array(recorded_at, pa.float64()),
+            }))
+            self.events += len(self.event_rows)
+            self.event_rows = []
+
+    def stats(self):
+        return {
+            "track_rows": self.track_rows,
+            "events": self.events,
+            "row_groups": self.row_groups,
+            "backlog": self.queue.qsize(),
+        }
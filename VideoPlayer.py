@@ -1,19 +1,124 @@
 # VideoPlayer.py
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from PyQt5.QtMultimediaWidgets import QVideoWidget
-from PyQt5.QtCore import QUrl, Qt
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QSlider, QMessageBox
+import numpy as np
+from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QMediaPlaylist
+from PyQt5.QtMultimediaWidgets import QGraphicsVideoItem
+from PyQt5.QtCore import QLineF, QRectF, QSizeF, QUrl, Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPen, QPixmap
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QSlider, QMessageBox, QCheckBox,
+                             QGraphicsItem, QGraphicsPixmapItem, QGraphicsScene, QGraphicsView)
 from PyQt5.QtCore import QTimer
 
+from HudOverlay import PANEL_COLOR
+from OverlayTrack import OverlayTrack
+from utils import compute_color_for_labels
+
+
+def qcolor(bgr):
+    # Colors in this project are OpenCV BGR tuples
+    return QColor(int(bgr[2]), int(bgr[1]), int(bgr[0]))
+
+
+class OverlayItem(QGraphicsItem):
+    """
+    Draws one frame of an OverlayTrack (lanes, boxes, labels, trails and count panels) over a
+    QGraphicsVideoItem, in video pixel coordinates scaled to where the video is shown.
+    """
+
+    def __init__(self, video_item):
+        super().__init__()
+        self.video_item = video_item
+        self.track = None
+        self.frame_index = None
+
+    def boundingRect(self):
+        return self.video_item.boundingRect()
+
+    def set_frame(self, frame_index):
+        if frame_index != self.frame_index:
+            self.frame_index = frame_index
+            self.update()
+
+    def paint(self, painter, option, widget=None):
+        native = self.video_item.nativeSize()
+        if self.track is None or self.frame_index is None or native.isEmpty():
+            return
+        track, index = self.track, self.frame_index
+        rect = self.video_item.boundingRect()
+        painter.save()
+        painter.translate(rect.topLeft())
+        painter.scale(rect.width() / native.width(), rect.height() / native.height())
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        blinking = track.blinking(index)
+        for i, lane in enumerate(track.lanes[:-1]):
+            painter.setPen(QPen(qcolor((255, 255, 255) if i in blinking else lane.color), lane.thickness))
+            painter.drawLine(QLineF(*lane.start(), *lane.end()))
+
+        font = QFont()
+        font.setPixelSize(18)
+        painter.setFont(font)
+        for ((x1, y1, x2, y2), track_id, class_id, name), trail in zip(track.frame(index), track.trails(index)):
+            color = qcolor(compute_color_for_labels(class_id))
+            trail = trail.tolist()
+            for i in range(1, len(trail)):
+                # Same thickness ramp as StreamAnalyzer.draw_trail
+                painter.setPen(QPen(color, int(np.sqrt(64 / float(i + i)) * 1.5)))
+                painter.drawLine(QLineF(*trail[i - 1], *trail[i]))
+            painter.setPen(QPen(color, 2))
+            painter.drawRect(QRectF(x1, y1, x2 - x1, y2 - y1))
+            label = f"{track_id}:{name}"
+            width = painter.fontMetrics().horizontalAdvance(label) + 6
+            painter.fillRect(QRectF(x1, y1 - 22, width, 22), color)
+            painter.setPen(QColor(255, 255, 255))
+            painter.drawText(x1 + 3, y1 - 5, label)
+
+        font.setPixelSize(26)
+        painter.setFont(font)
+        vehicle_in, vehicle_out = track.counts(index)
+        self.draw_panel(painter, "in", vehicle_in, native.width())
+        self.draw_panel(painter, "out", vehicle_out, native.width())
+        painter.restore()
+
+    @staticmethod
+    def draw_panel(painter, direction, counts, width):
+        # Same layout as HudOverlay's draw_panel_title / draw_panel_row; "in" is the right-hand panel
+        if not counts:
+            return
+        if direction == "in":
+            title, title_bar, row_bar = "Number of Vehicles Entering", (width - 500, width), (width - 150, width)
+            title_x, row_x = width - 500, width - 150
+        else:
+            title, title_bar, row_bar = "Number of Vehicles Leaving", (20, 500), (20, 127)
+            title_x, row_x = 11, 11
+        color = qcolor(PANEL_COLOR)
+        painter.fillRect(QRectF(title_bar[0], 5, title_bar[1] - title_bar[0], 40), color)
+        painter.setPen(QColor(255, 255, 255))
+        painter.drawText(title_x, 35, title)
+        for idx, (label, count) in enumerate(counts.items()):
+            y = 65 + idx * 40
+            painter.fillRect(QRectF(row_bar[0], y - 15, row_bar[1] - row_bar[0], 30), color)
+            painter.drawText(row_x, y + 10, f"{label}: {count}")
+
 
 class VideoPlayer(QWidget):
     def __init__(self):
         super().__init__()
 
-        # Initialize video player components
+        # Initialize video player components; the video is shown in a scene so overlays can be drawn on top
         self.player = QMediaPlayer()
-        self.video_widget = QVideoWidget()
+        self.scene = QGraphicsScene(self)
+        self.video_item = QGraphicsVideoItem()
+        self.overlay_item = OverlayItem(self.video_item)
+        self.preview_item = QGraphicsPixmapItem()  # Latest processed frame while a run is in progress
+        self.preview_item.setVisible(False)
+        self.scene.addItem(self.video_item)
+        self.scene.addItem(self.overlay_item)
+        self.scene.addItem(self.preview_item)
+        self.video_widget = QGraphicsView(self.scene)
         self.video_widget.setStyleSheet("background-color: black;")
+        self.video_widget.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.video_widget.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.video_item.nativeSizeChanged.connect(lambda size: self.overlay_item.prepareGeometryChange())
 
         # Layouts for buttons and video
         self.layout = QVBoxLayout()
@@ -24,6 +129,10 @@ class VideoPlayer(QWidget):
         self.play_button = QPushButton("Play")
         self.pause_button = QPushButton("Stop")
         self.replay_button = QPushButton("Replay")
+        self.overlay_toggle = QCheckBox("Overlays")
+        self.overlay_toggle.setChecked(True)
+        self.overlay_toggle.setEnabled(False)
+        self.overlay_toggle.toggled.connect(self.overlay_item.setVisible)
 
         self.play_button.clicked.connect(self.play_video)
         self.pause_button.clicked.connect(self.pause_video)
@@ -33,6 +142,7 @@ class VideoPlayer(QWidget):
         self.button_layout.addWidget(self.play_button)
         self.button_layout.addWidget(self.pause_button)
         self.button_layout.addWidget(self.replay_button)
+        self.button_layout.addWidget(self.overlay_toggle)
 
         # Create seekbar (QSlider)
         self.seekbar = QSlider(Qt.Horizontal)
@@ -50,22 +160,34 @@ class VideoPlayer(QWidget):
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_seekbar)
 
+        # Timer that keeps the overlay on the frame at player.position()
+        self.overlay_timer = QTimer(self)
+        self.overlay_timer.timeout.connect(self.update_overlay)
+
         # Initialize video source
         self.source = None
+        self.overlay = None
 
-    def play_video(self, source=None):
-        """Play the video, or start playing if source is passed."""
+    def play_video(self, source=None, overlay=None):
+        """
+        Play the video, or start playing if source is passed. overlay is a sidecar overlay file
+        (or an OverlayTrack) to draw over it; without one the video plays as it is.
+        """
         try:
+            self.stop_preview()
             if source:
                 self.source = source
+                self.set_overlay(overlay)
 
             if not self.source:
+                if self.player.playlist() is not None:
+                    self.player.play()  # Segments set up by play_segments
                 return
 
             # Set up video source
             media_content = QMediaContent(QUrl.fromLocalFile(self.source))
             self.player.setMedia(media_content)
-            self.player.setVideoOutput(self.video_widget)
+            self.player.setVideoOutput(self.video_item)
 
             # Play the video
             self.player.play()
@@ -86,6 +208,72 @@ class VideoPlayer(QWidget):
         self.player.setPosition(0)
         self.player.play()
 
+    def play_segments(self, paths):
+        """Plays finished output segments back to back, e.g. the part of a run processed so far."""
+        if not paths:
+            return
+        self.stop_preview()
+        self.set_overlay(None)
+        self.source = None
+        playlist = QMediaPlaylist(self.player)
+        for path in paths:
+            playlist.addMedia(QMediaContent(QUrl.fromLocalFile(path)))
+        self.player.setPlaylist(playlist)
+        self.player.setVideoOutput(self.video_item)
+        self.player.play()
+        self.seekbar.setEnabled(True)
+        self.timer.start(100)
+
+    def preview_size(self):
+        """(width, height) preview frames are downscaled to."""
+        size = self.video_widget.viewport().size()
+        return size.width(), size.height()
+
+    def show_preview(self, frame):
+        """Shows a BGR frame (already downscaled to preview_size) in place of the video."""
+        height, width = frame.shape[:2]
+        image = QImage(frame.data, width, height, frame.strides[0], QImage.Format_RGB888).rgbSwapped()
+        self.preview_item.setPixmap(QPixmap.fromImage(image))
+        view_width, view_height = self.preview_size()
+        self.preview_item.setPos((view_width - width) / 2, (view_height - height) / 2)
+        if not self.preview_item.isVisible():
+            self.player.stop()
+            self.video_item.setVisible(False)
+            self.overlay_item.setVisible(False)
+            self.preview_item.setVisible(True)
+
+    def previewing(self):
+        return self.preview_item.isVisible()
+
+    def stop_preview(self):
+        """Goes back to showing the player's video."""
+        self.preview_item.setVisible(False)
+        self.video_item.setVisible(True)
+        self.overlay_item.setVisible(self.overlay_toggle.isChecked())
+
+    def set_overlay(self, overlay):
+        """Sets the overlay drawn over the video: a sidecar file path, an OverlayTrack, or None to clear it."""
+        self.overlay = OverlayTrack.load(overlay) if isinstance(overlay, str) else overlay
+        self.overlay_item.track = self.overlay
+        self.overlay_item.frame_index = None
+        self.overlay_toggle.setEnabled(self.overlay is not None)
+        if self.overlay is not None:
+            self.overlay_timer.start(max(10, int(1000 / self.overlay.fps)))
+        else:
+            self.overlay_timer.stop()
+        self.overlay_item.update()
+
+    def update_overlay(self):
+        """Moves the overlay to the frame shown at the current position; a seek is a plain index lookup."""
+        self.overlay_item.set_frame(self.overlay.frame_at(self.player.position()))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        size = self.video_widget.viewport().size()
+        self.video_item.setSize(QSizeF(size))
+        self.scene.setSceneRect(0, 0, size.width(), size.height())
+        self.overlay_item.prepareGeometryChange()
+
     def update_seekbar(self):
         """Update the seekbar position based on the video time."""
         position = self.player.position()
@@ -0,0 +1,767 @@
+import cv2
+import logging
+import numpy as np
+import os
+import sys
+import time
+from collections import defaultdict
+from dataclasses import replace
+from AdaptiveStride import StrideController, interpolate_detections
+from DetectionCache import DetectionCache, DetectionCacheWriter, cache_key
+from Detections import Detections
+from EventLog import EventLog
+from EventStore import EventStore
+from FrameWriter import FrameWriter
+from Lane import crossing_roi
+from LiveSource import LiveSource
+from ModelBackend import load_model
+from MotionGate import MotionGate
+from OverlayTrack import OverlayTrackWriter, overlay_path
+from Pipeline import Pipeline
+from Progress import ProgressTracker
+from TrackExport import TrackExporter
+from utils import StreamAnalyzer
+
+logger = logging.getLogger(__name__)
+
+class VideoProcessor:
+    """
+    Processes videos using YOLO for object detection and tracking, without any GUI dependency.
+    Frames flow through a decode / inference / annotate / encode Pipeline joined by bounded queues.
+    By default annotated frames are streamed to a FrameWriter as they are produced;
+    with stream_output disabled they are buffered in memory and saved at the end.
+    Subclasses override on_progress / on_completed to report progress (see Predictor).
+    """
+
+    def __init__(self, model_path='zabir.pt', backend="pytorch", int8=False, **kwargs):
+        """
+        Initializes the YOLO model and sets up storage for processed frames.
+        backend selects pytorch, onnx or openvino; exported models are cached next to the weights.
+        """
+        super().__init__(**kwargs)
+        self.model_path = model_path
+        self.backend = backend
+        self.int8 = int8
+        self.model = load_model(model_path, backend, int8)
+        logger.debug("Model classes: %s", self.model.names)
+        self.class_list = self.model.names
+        self.class_counts = defaultdict(int)
+        self.analyzer = StreamAnalyzer()  # Lanes, track buffers and counters of the current stream
+        self.crossed_ids = set()
+
+        self.video_frames = []  # Stores annotated frames when stream_output is disabled
+        self.stream_output = True  # Stream frames to the encoder instead of buffering them
+        self.output_path = "runs/detect/output.mp4"
+        self.event_log_path = "data.txt"
+        self.segment_seconds = None  # Roll the streamed output into segments playable mid-run (one file is not)
+        self.metrics_only = False  # Track and count without drawing or encoding an annotated video
+        self.render_every = None  # In metrics-only mode, still render and encode every n-th frame (at fps / n)
+        self.render_windows = []  # In metrics-only mode, still render (start, end) second ranges, back to back
+        self.overlay_track = False  # Write a sidecar overlay file for playback instead of an annotated video
+        self.writer = None
+        self.queue_size = 8  # Capacity of each queue between pipeline stages
+        self.batch_size = 1  # Frames sent to the detector per call
+        self.classes = [1, 2, 3, 5, 6, 7]  # Class filter passed to the tracker
+        self.use_cache = True  # Replay cached detections instead of re-running YOLO
+        self.cache_dir = "runs/cache"
+        self.cache = None
+        self.cache_writer = None
+        self.pipeline = None
+        self.stage_stats = {}  # Per-stage throughput of the last run
+        self.live = False  # Continuous mode for cameras / streams: bounded buffer, no end-of-video save
+        self.loop = False  # In live mode, replay a file forever as a camera stand-in
+        self.buffer_size = 8  # Frames the live input buffer holds before the drop policy applies
+        self.drop_policy = "drop_oldest"  # drop_oldest, drop_newest or drop_every_k
+        self.drop_every = 2  # k for drop_every_k
+        self.live_segment_seconds = 60  # Length of the rolling output segments in live mode
+        self.log_flush_seconds = 1.0  # Buffered events are appended to the event log at least this often
+        self.log_fsync = "close"  # When the event log is fsynced: never, on close or after every flush
+        self.event_log = None
+        self.event_store_path = None  # SQLite event store (EventStore) written next to the text log, if set
+        self.source_id = None  # Video / camera ID stored with every event; defaults to the source path or URL
+        self.event_store = None
+        self.track_export_dir = None  # Columnar export of per-frame tracks and events (TrackExporter), if set
+        self.track_export_format = "parquet"  # parquet or arrow
+        self.track_exporter = None  # Kept after the run is closed for its stats
+        self.overlay_writer = None
+        self.preview = None  # LatestFrame the GUI shows while processing runs, if set
+        self.live_source = None
+        self.capture_times = {}  # Frame index -> time it was decoded, for latency
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_count = 0
+        self.motion_gating = False  # Skip detection on frames without motion around the crossing line
+        self.motion_margin = 120  # Pixels above and below the crossing line that are checked for motion
+        self.motion_sensitivity = 0.002  # Fraction of changed band pixels that counts as motion
+        self.motion_pixel_threshold = 25
+        self.motion_max_skip = 30  # Run the detector at least every this many frames
+        self.gate = None
+        self.last_detections = None
+        self.roi_inference = False  # Run detection only on the region around the lanes and crossing line
+        self.roi_margin = 200  # Pixels added around the lanes / crossing line on every side
+        self.roi = None  # (x1, y1, x2, y2) crop of the current run
+        self.inference_size = None  # Longest side of the frames sent to the detector (None = full resolution)
+        self.inference_buffers = []  # Reused resize targets, one per frame of a batch
+        self.adaptive_stride = False  # Detect every k-th frame and interpolate boxes in between
+        self.min_stride = 1
+        self.max_stride = 6
+        self.stride_controller = None
+        self.stride_pending = []  # Frames held back until the next keyframe
+        self.stride_previous = (None, None)  # Detections and frame index of the last keyframe
+        self.video_properties = {}  # Stores video properties (width, height, FPS, total frames)
+        self.total_frames = 0
+        self.current_frame = 0
+        self.progress_interval = 0.25  # Seconds between progress reports, however fast frames are processed
+        self.progress = ProgressTracker(self.progress_interval)
+        self.source = 0
+
+    def on_progress(self, progress):
+        """
+        Called from the annotation stage with a Progress (frame, total, FPS, ETA) at most every
+        progress_interval seconds, and once more when the run ends.
+        """
+        logger.debug("%s", progress)
+
+    def on_segment(self, path):
+        """
+        Called from the encode stage whenever an output segment is finalized and playable.
+        """
+
+    def on_completed(self):
+        """
+        Called once the annotated video (or the overlay track) and the event log have been written.
+        """
+
+    def track_frames(self, frames):
+        """
+        Runs YOLO tracking on consecutive frames in a single call.
+        For a list source ultralytics updates the single persistent tracker once per result,
+        in list order, so track IDs match what frame-by-frame tracking would produce.
+        """
+        offset = (0, 0)
+        if self.roi is not None:
+            # Only the region around the crossing line goes to the detector
+            x1, y1, x2, y2 = self.roi
+            frames = [frame[y1:y2, x1:x2] for frame in frames]
+            offset = (x1, y1)
+
+        height, width = frames[0].shape[:2]
+        frames, size = self.resize_for_inference(frames)
+        options = {}
+        if size is not None and self.backend != "openvino":
+            # Let the model letterbox to the reduced size instead of scaling back up to its default
+            options["imgsz"] = -(-max(size) // 32) * 32
+        elif self.roi is not None:
+            frames = [np.ascontiguousarray(frame) for frame in frames]
+
+        source = frames[0] if len(frames) == 1 else frames
+        results = self.model.track(source, persist=True, classes=self.classes, **options)
+        detections = [Detections.from_result(result) for result in results]
+        for frame_detections in detections:
+            if frame_detections is not None:
+                if size is not None:
+                    # Back to crop / full-frame pixels so draw_boxes renders at full resolution
+                    scale = np.array([width / size[0], height / size[1]] * 2, dtype=np.float32)
+                    frame_detections.boxes = frame_detections.boxes * scale
+                frame_detections.offset = offset
+        return detections
+
+    def resize_for_inference(self, frames):
+        """
+        Downscales frames so their longest side is inference_size, into buffers reused across calls.
+        Returns the resized frames and their (width, height), or the frames unchanged and None.
+        """
+        height, width = frames[0].shape[:2]
+        if not self.inference_size or max(height, width) <= self.inference_size:
+            return frames, None
+
+        scale = self.inference_size / max(height, width)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        shape = (size[1], size[0], frames[0].shape[2])
+        if not self.inference_buffers or self.inference_buffers[0].shape != shape:
+            self.inference_buffers = []
+        while len(self.inference_buffers) < len(frames):
+            self.inference_buffers.append(np.empty(shape, dtype=np.uint8))
+
+        resized = [cv2.resize(frame, size, dst=buffer, interpolation=cv2.INTER_AREA)
+                   for frame, buffer in zip(frames, self.inference_buffers)]
+        return resized, size
+
+    def infer(self, frames):
+        """
+        Detections for consecutive frames. With motion gating, frames without motion in the
+        crossing band skip the detector and carry the previous frame's detections forward,
+        marked stale so they are only drawn again.
+        """
+        if self.gate is None:
+            detections = self.track_frames(frames)
+        else:
+            moving = [self.gate.should_detect(frame) for frame in frames]
+            detected = [frame for frame, move in zip(frames, moving) if move]
+            detected = iter(self.track_frames(detected) if detected else [])
+            detections = []
+            for move in moving:
+                if move:
+                    self.last_detections = next(detected)
+                    detections.append(self.last_detections)
+                elif self.last_detections is not None:
+                    detections.append(replace(self.last_detections, stale=True))
+                else:
+                    detections.append(None)
+        return detections
+
+    def detect(self, item):
+        """
+        Inference stage: runs YOLO tracking on one decoded frame.
+        """
+        frame_index, frame = item
+        return frame_index, frame, self.infer([frame])[0]
+
+    def detect_batch(self, items):
+        """
+        Batched inference stage: sends up to batch_size decoded frames to YOLO in one call.
+        """
+        detections = self.infer([frame for _, frame in items])
+        return [
+            (frame_index, frame, frame_detections)
+            for (frame_index, frame), frame_detections in zip(items, detections)
+        ]
+
+    def detect_strided(self, item):
+        """
+        Adaptive-stride inference stage: holds frames back until the next keyframe, detects only
+        the keyframe and interpolates the boxes of the frames in between.
+        """
+        self.stride_controller.frames += 1
+        self.stride_pending.append(item)
+        if len(self.stride_pending) < self.stride_controller.stride:
+            return []
+        return self.resolve_stride()
+
+    def resolve_stride(self):
+        """
+        Detects the last held frame and releases every held frame with its detections.
+        Also called at the end of the video for a final, shorter stride.
+        """
+        items, self.stride_pending = self.stride_pending, []
+        if not items:
+            return []
+
+        key_index, key_frame = items[-1]
+        detections = self.infer([key_frame])[0]
+        self.stride_controller.keyframes += 1
+
+        previous, previous_index = self.stride_previous
+        span = key_index - previous_index if previous_index is not None else 0
+        processed = []
+        for frame_index, frame in items[:-1]:
+            alpha = (frame_index - previous_index) / span if span else 1.0
+            processed.append((frame_index, frame, interpolate_detections(previous, detections, alpha)))
+        processed.append((key_index, key_frame, detections))
+
+        self.stride_controller.update(previous, detections, span)
+        self.stride_previous = (detections, key_index)
+        return processed
+
+    def replay(self, item):
+        """
+        Inference stage on a cache hit: looks up the stored boxes, classes and track IDs.
+        """
+        frame_index, frame = item
+        return frame_index, frame, self.cache.get(frame_index - 1)
+
+    def open_cache(self):
+        """
+        Loads the detection cache for the current source, or prepares a writer to build it.
+        Plain detections do not depend on the lanes, so any later lane geometry can replay them;
+        options derived from the crossing line (ROI, motion gate, adaptive stride) put it in the key
+        (see cache_options).
+        """
+        self.cache = None
+        self.cache_writer = None
+        if not self.use_cache:
+            return
+
+        key = cache_key(self.source, self.model_path, self.classes, **self.cache_options())
+        self.cache = DetectionCache.load(self.cache_dir, key)
+        if self.cache is not None:
+            logger.info(f"Replaying cached detections ({len(self.cache)} frames)")
+        else:
+            self.cache_writer = DetectionCacheWriter(DetectionCache.path_for(self.cache_dir, key))
+
+    def cache_options(self):
+        """
+        Inference settings that change the stored detections and therefore belong in the cache key.
+        """
+        options = {}
+        if self.roi is not None:
+            options["roi"] = ",".join(str(v) for v in self.roi)
+        if self.backend != "pytorch":
+            options["backend"] = f"{self.backend}{'-int8' if self.int8 else ''}"
+        if self.inference_size:
+            options["size"] = self.inference_size
+        if self.stride_controller is not None:
+            # Keyframes are chosen by distance to the crossing line, so a moved line needs new detections
+            options["stride"] = f"{self.stride_controller.crossing_y},{self.min_stride},{self.max_stride}"
+        if self.gate is not None:
+            # Frames were skipped by motion in the band around the crossing line, so a moved line needs new detections
+            options["motion"] = (f"{self.gate.crossing_y},{self.motion_margin},{self.motion_sensitivity},"
+                                 f"{self.motion_pixel_threshold},{self.motion_max_skip}")
+        return options
+
+    def create_roi(self):
+        """
+        Derives the inference crop from the lane and crossing geometry, when ROI inference is enabled.
+        """
+        self.roi = None
+        if self.roi_inference and self.analyzer.lanes:
+            self.roi = crossing_roi(self.analyzer.lanes, self.video_properties["frame_width"],
+                                    self.video_properties["frame_height"], margin=self.roi_margin)
+            logger.info(f"Inference ROI: {self.roi}")
+
+    def create_stride(self):
+        """
+        Builds the stride controller around the current crossing line, when adaptive stride is enabled.
+        """
+        self.stride_controller = None
+        self.stride_pending = []
+        self.stride_previous = (None, None)
+        if self.adaptive_stride and self.analyzer.lanes:
+            self.stride_controller = StrideController(self.analyzer.lanes[-1].y, min_stride=self.min_stride,
+                                                      max_stride=self.max_stride)
+
+    def open_event_sinks(self):
+        """
+        Starts the incremental event log of the current run, plus the SQLite event store and the
+        columnar track export when configured; every new event is written to them as it happens.
+        """
+        self.close_event_sinks()
+        self.event_log = EventLog(self.event_log_path, flush_seconds=self.log_flush_seconds, fsync=self.log_fsync)
+        self.analyzer.sinks = [self.event_log]
+        self.analyzer.track_sinks = []
+        self.analyzer.crossing_sinks = []
+        self.track_exporter = None
+        self.overlay_writer = None
+        if self.event_store_path is not None:
+            # Files are timed from their first frame, live streams in wall-clock time
+            self.event_store = EventStore(self.event_store_path,
+                                          self.source_id if self.source_id is not None else self.source,
+                                          fps=self.video_properties.get("fps"),
+                                          time_origin=time.time() if self.live else 0.0,
+                                          flush_seconds=self.log_flush_seconds)
+            self.analyzer.sinks.append(self.event_store)
+        if self.track_export_dir is not None:
+            self.track_exporter = TrackExporter(self.track_export_dir, format=self.track_export_format)
+            self.analyzer.sinks.append(self.track_exporter)
+            self.analyzer.track_sinks.append(self.track_exporter)
+        if self.overlay_track and not self.live:
+            # Kept in memory until the run ends, so only for files
+            self.overlay_writer = OverlayTrackWriter(self.overlay_track_path(), self.analyzer.lanes,
+                                                     fps=self.video_properties.get("fps"))
+            self.analyzer.track_sinks.append(self.overlay_writer)
+            self.analyzer.crossing_sinks.append(self.overlay_writer)
+
+    def close_event_sinks(self):
+        """
+        Writes out any buffered events and closes the log, store, export and overlay track; safe to call more than once.
+        A close error is raised after every sink is closed, unless the run is already failing with another one.
+        """
+        error = self.analyzer.close_sinks()
+        self.event_log = None
+        self.event_store = None
+        if error is not None and sys.exc_info()[1] is None:
+            raise error
+
+    def create_gate(self):
+        """
+        Builds the motion gate around the current crossing line, when motion gating is enabled.
+        """
+        self.gate = None
+        self.last_detections = None
+        if self.motion_gating and self.analyzer.lanes:
+            self.gate = MotionGate(self.analyzer.lanes[-1].y, margin=self.motion_margin,
+                                   sensitivity=self.motion_sensitivity,
+                                   pixel_threshold=self.motion_pixel_threshold, max_skip=self.motion_max_skip)
+
+    def reset_tracker(self):
+        """
+        Clears the persistent tracker so track IDs from a previous video do not carry over.
+        """
+        predictor = getattr(self.model, "predictor", None)
+        for tracker in getattr(predictor, "trackers", []):
+            tracker.reset()
+
+    def overlay_track_path(self):
+        """
+        Sidecar overlay file of the current output, e.g. runs/detect/output.overlay.npz.
+        """
+        return overlay_path(self.output_path)
+
+    def skips_rendering(self):
+        """
+        Whether frames are only rendered when sampled: in metrics-only mode, and when a file run
+        writes an overlay track that the player draws instead.
+        """
+        return self.metrics_only or (self.overlay_track and not self.live)
+
+    def renders_output(self):
+        """
+        Whether this run produces an annotated video: always, unless rendering is skipped without any sampling.
+        """
+        return not self.skips_rendering() or bool(self.render_every) or bool(self.render_windows)
+
+    def should_render(self, frame_index):
+        """
+        Whether the frame is drawn and encoded; when rendering is skipped only the sampled frames are.
+        """
+        if not self.skips_rendering():
+            return True
+        if self.render_every and (frame_index - 1) % self.render_every == 0:
+            return True
+        return self.in_render_window(frame_index)
+
+    def in_render_window(self, frame_index):
+        seconds = (frame_index - 1) / (self.video_properties.get("fps") or 30)
+        return any(start <= seconds < end for start, end in self.render_windows)
+
+    def output_fps(self):
+        """
+        Frame rate of the annotated output. Sampling only every n-th frame writes at fps / n, so
+        the output keeps the source's timeline; otherwise the source frame rate.
+        """
+        fps = self.video_properties.get("fps") or 30
+        if self.skips_rendering() and self.render_every and not self.render_windows:
+            return fps / self.render_every
+        return fps
+
+    def output_repeats(self, frame_index):
+        """
+        How many times a rendered frame is written. With render_every and render windows together
+        the output runs at the source rate, so frames sampled outside a window are held for
+        render_every frames to keep their duration.
+        """
+        if (self.skips_rendering() and self.render_every and self.render_windows
+                and not self.in_render_window(frame_index)):
+            return self.render_every
+        return 1
+
+    def annotate(self, item):
+        """
+        Annotation stage: draws boxes, trails and counters onto the frame.
+        Frames that are not rendered (metrics-only mode) are still tracked and counted, and passed
+        on as None so the encoder skips them. With a preview set, a frame is also rendered whenever
+        the preview is due for one, and published to it.
+        """
+        frame_index, frame, detections = item
+
+        self.current_frame = frame_index  # Update current frame count
+        progress = self.progress.update(frame_index)
+        if progress is not None:
+            self.on_progress(progress)
+
+        # Frames reach this stage in order whichever inference mode produced them
+        if self.cache_writer is not None:
+            self.cache_writer.add(detections)
+
+        render = self.should_render(frame_index)
+        preview = self.preview is not None and self.preview.due()
+        # Ensure results are not empty
+        if detections is not None:
+            # Draw bounding boxes and tracking info
+            frame = self.analyzer.draw_boxes(frame, detections.boxes, self.class_list, detections.class_indices,
+                               identities=detections.track_ids, offset=detections.offset,
+                               frame_index=frame_index, render=render or preview, stale=detections.stale)
+        if preview:
+            self.preview.publish(frame_index, frame)
+
+        # Events are appended as they happen; this writes out the buffered ones every few seconds
+        for sink in self.analyzer.sinks:
+            sink.poll()
+        return frame_index, frame if render else None
+
+    def encode(self, item):
+        """
+        Writer stage: streams the processed frame to the encoder, or stores it in memory.
+        """
+        frame_index, frame = item
+        if frame is None:
+            pass  # Not rendered in metrics-only mode
+        elif self.writer is not None:
+            for _ in range(self.output_repeats(frame_index)):
+                self.writer.encode(frame)
+        elif self.renders_output():
+            self.video_frames.extend([frame] * self.output_repeats(frame_index))
+
+        captured = self.capture_times.pop(frame_index, None)
+        if captured is not None:
+            latency = time.perf_counter() - captured
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            self.latency_count += 1
+
+    def latency_stats(self):
+        """
+        End-to-end latency from decode (or capture, in live mode) to encode, in milliseconds.
+        """
+        mean = self.latency_total / self.latency_count if self.latency_count else 0.0
+        return {"mean_ms": round(mean * 1000, 1), "max_ms": round(self.latency_max * 1000, 1)}
+
+    def stats(self):
+        """
+        Frames processed, dropped-frame counts (live mode), motion-gate skips and latency of the current run.
+        """
+        stats = {"frames": self.current_frame, **self.latency_stats(), "counts": self.analyzer.counter.stats()}
+        if self.live_source is not None:
+            stats.update(self.live_source.stats())
+        if self.gate is not None:
+            stats["motion_gate"] = self.gate.stats()
+        if self.stride_controller is not None:
+            stats["stride"] = self.stride_controller.stats()
+        if self.analyzer.sprites is not None:
+            stats["label_sprites"] = self.analyzer.sprites.stats()
+        if self.track_exporter is not None:
+            stats["track_export"] = self.track_exporter.stats()
+        if self.preview is not None:
+            stats["preview"] = self.preview.stats()
+        return stats
+
+    def reset_run(self):
+        """
+        Clears tracker, counters and latency bookkeeping before a new run.
+        """
+        self.reset_tracker()
+        self.analyzer.reset()
+        self.analyzer.fps = self.video_properties.get("fps") or None
+        self.create_gate()
+        self.create_roi()
+        self.create_stride()
+        self.open_event_sinks()
+        if self.preview is not None:
+            self.preview.reset()
+        self.capture_times = {}
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_count = 0
+        self.current_frame = 0
+        self.progress.interval = self.progress_interval
+        self.progress.start(self.total_frames)
+
+    def add_processing_stages(self):
+        """
+        Adds the inference, annotate and encode stages after the decoder.
+        """
+        if self.cache is not None:
+            self.pipeline.add_stage("inference", self.replay)
+        elif self.stride_controller is not None:
+            self.pipeline.add_stage("inference", self.detect_strided, many=True, flush=self.resolve_stride)
+        elif self.batch_size > 1:
+            self.pipeline.add_stage("inference", self.detect_batch, batch_size=self.batch_size)
+        else:
+            self.pipeline.add_stage("inference", self.detect)
+        self.pipeline.add_stage("annotate", self.annotate)
+        self.pipeline.add_stage("encode", self.encode)
+
+    def stop(self):
+        """
+        Stops a running prediction. A live run drains what is already buffered and then finishes normally.
+        """
+        if self.live_source is not None:
+            self.live_source.stop()
+        elif self.pipeline is not None:
+            self.pipeline.stop()
+
+    def predict_live(self):
+        """
+        Continuous mode for live feeds: a LiveSource fills a bounded buffer under the configured
+        drop policy, output rolls into segment files and events are flushed to the log periodically.
+        Runs until the stream ends or stop() is called.
+        """
+        try:
+            self.live_source = LiveSource(self.source, buffer_size=self.buffer_size, policy=self.drop_policy,
+                                          drop_every=self.drop_every, loop=self.loop)
+        except IOError as e:
+            logger.error(f"Error: {e}")
+            return False
+
+        self.video_properties = {
+            "frame_width": self.live_source.frame_width,
+            "frame_height": self.live_source.frame_height,
+            "fps": self.live_source.fps,
+            "total_frames": 0
+        }
+        self.total_frames = 0
+        self.writer = None
+        if self.renders_output():
+            self.writer = FrameWriter(
+                self.output_path,
+                self.output_fps(),
+                (self.video_properties["frame_width"], self.video_properties["frame_height"]),
+                segment_seconds=self.live_segment_seconds,
+                on_segment=self.on_segment
+            )
+
+        def decode():
+            """
+            Decoder stage: takes the next buffered frame, or returns None once the stream has stopped.
+            """
+            item = self.live_source.get()
+            if item is None:
+                return None
+            frame_index, frame, captured = item
+            self.capture_times[frame_index] = captured
+            return frame_index, frame
+
+        self.reset_run()
+        self.cache = None
+        self.cache_writer = None
+        self.pipeline = Pipeline(queue_size=self.queue_size)
+        self.pipeline.add_stage("decode", decode)
+        self.add_processing_stages()
+
+        self.live_source.start()
+        try:
+            self.pipeline.run()
+        finally:
+            self.live_source.stop()
+            if self.writer is not None:
+                self.writer.finalize()
+            self.close_event_sinks()
+        self.stage_stats = self.pipeline.stats()
+
+        self.on_progress(self.progress.finish(self.current_frame))
+        logger.info(self.pipeline.report())
+        logger.info(f"Live run stats: {self.stats()}")
+        if self.writer is not None:
+            logger.info(f"Annotated segments saved at: {', '.join(self.writer.segments)}")
+        else:
+            logger.info("Metrics-only run: no annotated video written")
+        self.writer = None
+        self.live_source = None
+        self.on_completed()
+        return True
+
+    def predict(self):
+        """
+        Reads frames from a video file and runs them through the decode / inference / annotate /
+        encode pipeline, streaming annotated frames to disk. Returns False if the video cannot be opened.
+        """
+        if self.live:
+            return self.predict_live()
+
+        cap = cv2.VideoCapture(self.source)
+
+        if not cap.isOpened():
+            logger.error(f"Error: Could not open video {self.source}.")
+            return False
+
+        # Store video properties
+        self.video_properties = {
+            "frame_width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "frame_height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": cap.get(cv2.CAP_PROP_FPS),
+            "total_frames": int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        }
+        self.total_frames = self.video_properties["total_frames"]
+
+        logger.info(
+            f"Total frames: {self.total_frames}, Resolution: {self.video_properties['frame_width']}x{self.video_properties['frame_height']}, FPS: {self.video_properties['fps']}")
+
+        self.video_frames = []
+        self.writer = None
+        if self.stream_output and self.renders_output():
+            self.writer = FrameWriter(
+                self.output_path,
+                self.output_fps(),
+                (self.video_properties["frame_width"], self.video_properties["frame_height"]),
+                segment_seconds=self.segment_seconds,
+                on_segment=self.on_segment
+            )
+
+        frame_count = 0
+
+        def decode():
+            """
+            Decoder stage: reads the next frame, or returns None at the end of the video.
+            """
+            nonlocal frame_count
+            ret, frame = cap.read()
+            if not ret:
+                return None
+            frame_count += 1
+            self.capture_times[frame_count] = time.perf_counter()
+            return frame_count, frame
+
+        self.reset_run()
+        self.pipeline = Pipeline(queue_size=self.queue_size)
+        self.pipeline.add_stage("decode", decode)
+        self.open_cache()
+        self.add_processing_stages()
+        try:
+            self.pipeline.run()
+        finally:
+            cap.release()
+            if self.writer is not None:
+                self.writer.finalize()
+            self.close_event_sinks()
+        self.stage_stats = self.pipeline.stats()
+
+        # Only a complete run is cached, so a replay never misses frames: not one cut short by stop()
+        if self.cache_writer is not None:
+            if self.pipeline.abort.is_set():
+                logger.info("Run stopped early: detection cache not saved")
+            elif len(self.cache_writer) != frame_count:
+                logger.warning(f"Detection cache has {len(self.cache_writer)} of {frame_count} frames: not saved")
+            else:
+                self.cache_writer.save()
+            self.cache_writer = None
+        self.on_progress(self.progress.finish(self.current_frame))
+        logger.info(self.pipeline.report())
+        if self.gate is not None:
+            logger.info(f"Motion gate: {self.gate.stats()}")
+        if self.stride_controller is not None:
+            logger.info(f"Adaptive stride: {self.stride_controller.stats()}")
+        if self.analyzer.sprites is not None:
+            logger.info(f"Label sprites: {self.analyzer.sprites.stats()}")
+
+        if self.writer is not None:
+            self.finish_stream()
+        elif self.renders_output():
+            self.save_video(self.output_path)
+        else:
+            if self.overlay_writer is not None:
+                logger.info(f"Overlay track saved at: {self.overlay_writer.path} ({self.overlay_writer.stats()})")
+            else:
+                logger.info(f"Metrics-only run: no annotated video written, counts {self.analyzer.counter.stats()}")
+            self.on_completed()
+        logger.info("Video processing completed.")
+        return True
+
+    def finish_stream(self):
+        """
+        Finalizes the streamed output once every frame has been encoded.
+        """
+        logger.info(f"Annotated video saved at: {', '.join(self.writer.segments)} ({self.writer.frames_written} frames)")
+        self.writer = None
+        self.on_completed()
+
+    def save_video(self, output_path="runs/detect/output.mp4"):
+        """
+        Saves the buffered frames as a video file.
+        """
+        if not self.video_frames:
+            logger.warning("No frames to save!")
+            return
+
+        # Create output directory if it doesn't exist
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        out = cv2.VideoWriter(output_path, fourcc, self.output_fps(),
+                              (self.video_properties["frame_width"], self.video_properties["frame_height"]))
+
+        for frame in self.video_frames:
+            out.write(frame)
+
+        out.release()
+        logger.info(f"Annotated video saved at: {output_path}")
+        self.on_completed()
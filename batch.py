@@ -0,0 +1,204 @@
+"""
+Headless batch processing: runs many videos through VideoProcessor on a pool of worker processes.
+
+Usage:
+    python batch.py recordings/ extra.mp4 --lanes lanes.json --workers 4 --output runs/batch
+
+Each worker loads the model once and then processes videos one after another. Every video gets
+its own <output>/<name>/output.mp4 and <output>/<name>/data.txt event log; with --events-db all
+events also go to one SQLite event store, tagged with the video path, and with --export-tracks
+the per-frame tracks and events are written next to them as tracks.parquet / events.parquet
+(or .arrow). Lane configurations are saved from the lane adjustment window with the "Save" button.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv")
+
+_processor = None
+_lanes_path = None
+
+
+def collect_videos(paths):
+    """
+    Expands directories into the video files they contain, keeping explicit files as given.
+    """
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(VIDEO_EXTENSIONS):
+                    videos.append(os.path.join(path, name))
+        elif os.path.isfile(path):
+            videos.append(path)
+        else:
+            print(f"Skipping {path}: not a file or directory")
+    return videos
+
+
+def init_worker(model_path, backend, int8, lanes_path, options, threads, log_level):
+    """
+    Runs once per worker process: sets up logging, limits torch threads and loads the model.
+    """
+    global _processor, _lanes_path
+    import torch
+    from VideoProcessor import VideoProcessor
+
+    logging.basicConfig(level=log_level, format=f"[{os.getpid()}] %(message)s")
+    torch.set_num_threads(threads)
+    _lanes_path = lanes_path
+    _processor = VideoProcessor(model_path, backend=backend, int8=int8)
+    for name, value in options.items():
+        setattr(_processor, name, value)
+
+
+def process_video(video, output_dir):
+    """
+    Processes one video in a worker and returns its summary row.
+    """
+    from Lane import load_calibration, load_lanes
+
+    name = os.path.splitext(os.path.basename(video))[0]
+    video_dir = os.path.join(output_dir, name)
+    os.makedirs(video_dir, exist_ok=True)
+
+    _processor.analyzer.lanes = load_lanes(_lanes_path)
+    _processor.analyzer.calibration = load_calibration(_lanes_path)
+    _processor.source = video
+    _processor.output_path = os.path.join(video_dir, "output.mp4")
+    _processor.event_log_path = os.path.join(video_dir, "data.txt")
+    open(_processor.event_log_path, 'w').close()
+    if _processor.track_export_format is not None:
+        _processor.track_export_dir = video_dir
+
+    start = time.perf_counter()
+    try:
+        ok = _processor.predict()
+        error = None if ok else "could not open video"
+    except Exception as e:
+        error = repr(e)
+    elapsed = time.perf_counter() - start
+
+    frames = _processor.current_frame if error is None else 0
+    return {
+        "video": video,
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "in": sum(_processor.analyzer.vehicle_in.values()),
+        "out": sum(_processor.analyzer.vehicle_out.values()),
+        "error": error,
+    }
+
+
+def print_summary(rows, elapsed, workers):
+    print()
+    print(f"{'video':<40} {'frames':>8} {'seconds':>9} {'FPS':>8} {'in':>5} {'out':>5}")
+    for row in rows:
+        if row["error"]:
+            print(f"{os.path.basename(row['video']):<40} FAILED: {row['error']}")
+            continue
+        print(f"{os.path.basename(row['video']):<40} {row['frames']:>8} {row['seconds']:>9.1f} "
+              f"{row['fps']:>8.2f} {row['in']:>5} {row['out']:>5}")
+
+    frames = sum(row["frames"] for row in rows)
+    failed = sum(1 for row in rows if row["error"])
+    print(f"\n{len(rows) - failed}/{len(rows)} videos, {frames} frames in {elapsed:.1f}s "
+          f"on {workers} workers: {frames / elapsed if elapsed > 0 else 0:.2f} FPS total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Video files and/or directories of videos")
+    parser.add_argument("--lanes", required=True, help="Lane configuration saved from the lane adjustment window")
+    parser.add_argument("--model", default="zabir.pt")
+    parser.add_argument("--output", default="runs/batch")
+    parser.add_argument("--workers", type=int, default=max(1, os.cpu_count() // 4))
+    parser.add_argument("--threads", type=int, default=0,
+                        help="Torch threads per worker (default: CPU count divided by workers)")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--backend", choices=("pytorch", "onnx", "openvino"), default="pytorch",
+                        help="Inference backend; onnx/openvino exports are built once and cached next to the model")
+    parser.add_argument("--int8", action="store_true", help="INT8-quantized model (openvino backend only)")
+    parser.add_argument("--no-cache", action="store_true", help="Always run the detector")
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="Skip detection on frames without motion around the crossing line")
+    parser.add_argument("--motion-sensitivity", type=float, default=0.002)
+    parser.add_argument("--roi", action="store_true", help="Detect only in the region around the lanes")
+    parser.add_argument("--roi-margin", type=int, default=200)
+    parser.add_argument("--inference-size", type=int, default=None,
+                        help="Longest side of the frames sent to the detector (default: full resolution)")
+    parser.add_argument("--adaptive-stride", action="store_true",
+                        help="Detect every k-th frame, choosing k from track motion, and interpolate in between")
+    parser.add_argument("--max-stride", type=int, default=6)
+    parser.add_argument("--events-db", default=None,
+                        help="SQLite event store shared by all workers (e.g. runs/batch/events.sqlite)")
+    parser.add_argument("--export-tracks", choices=("parquet", "arrow"), default=None,
+                        help="Also write per-frame tracks and events as columnar files (needs pyarrow)")
+    parser.add_argument("--metrics-only", action="store_true",
+                        help="Track and count without drawing or encoding an annotated video")
+    parser.add_argument("--overlay-track", action="store_true",
+                        help="Write output.overlay.npz for playback over the original video instead of output.mp4")
+    parser.add_argument("--render-every", type=int, default=None,
+                        help="With --metrics-only, still render every n-th frame into the output video")
+    parser.add_argument("--render-window", type=float, nargs=2, action="append", default=[], metavar=("START", "END"),
+                        help="With --metrics-only, still render this range of seconds (repeatable)")
+    parser.add_argument("--log-level", choices=("DEBUG", "INFO", "WARNING", "ERROR"), default="INFO",
+                        help="DEBUG adds per-frame progress and crossing diagnostics")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level, format="%(message)s")
+
+    videos = collect_videos(args.inputs)
+    if not videos:
+        print("No videos to process.")
+        return 1
+
+    workers = max(1, min(args.workers, len(videos)))
+    threads = args.threads or max(1, os.cpu_count() // workers)
+    options = {
+        "batch_size": args.batch_size,
+        "use_cache": not args.no_cache,
+        "motion_gating": args.motion_gate,
+        "motion_sensitivity": args.motion_sensitivity,
+        "roi_inference": args.roi,
+        "roi_margin": args.roi_margin,
+        "inference_size": args.inference_size,
+        "adaptive_stride": args.adaptive_stride,
+        "max_stride": args.max_stride,
+        "event_store_path": args.events_db,
+        "track_export_format": args.export_tracks,
+        "metrics_only": args.metrics_only,
+        "overlay_track": args.overlay_track,
+        "render_every": args.render_every,
+        "render_windows": [tuple(window) for window in args.render_window],
+    }
+    print(f"Processing {len(videos)} videos on {workers} workers ({threads} threads each)")
+
+    # Export once here so the workers don't race to build the same artifact
+    from ModelBackend import ensure_exported
+    ensure_exported(args.model, args.backend, args.int8)
+
+    # spawn keeps each worker free of torch state inherited from the parent
+    context = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    rows = []
+    with context.Pool(workers, initializer=init_worker,
+                      initargs=(args.model, args.backend, args.int8, args.lanes, options, threads,
+                                args.log_level)) as pool:
+        results = [pool.apply_async(process_video, (video, args.output)) for video in videos]
+        for result in results:
+            row = result.get()
+            rows.append(row)
+            status = row["error"] or f"{row['frames']} frames, {row['fps']:.2f} FPS"
+            print(f"Finished {row['video']}: {status}")
+
+    print_summary(rows, time.perf_counter() - start, workers)
+    return 0 if all(row["error"] is None for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
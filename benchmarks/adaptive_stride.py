@@ -0,0 +1,76 @@
+"""
+Adaptive frame stride against detecting every frame and against fixed strides: detector calls,
+time and whether the counts and crossing events agree with the every-frame baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.adaptive_stride --video assets/short.mp4 --lanes lanes.json --strides 2 4 --max-stride 6
+
+A fixed stride k is an adaptive run with min_stride = max_stride = k. Every run bypasses the
+detection cache so each one really runs the detector.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from Lane import load_lanes
+from VideoProcessor import VideoProcessor
+
+
+def run(processor, video, lanes_path, min_stride, max_stride, output_dir):
+    processor.analyzer.lanes = load_lanes(lanes_path)
+    processor.source = video
+    processor.use_cache = False
+    processor.adaptive_stride = max_stride > 1
+    processor.min_stride = min_stride
+    processor.max_stride = max_stride
+    name = f"stride_{min_stride}_{max_stride}"
+    processor.output_path = os.path.join(output_dir, f"{name}.mp4")
+    processor.event_log_path = os.path.join(output_dir, f"{name}.txt")
+
+    start = time.perf_counter()
+    processor.predict()
+    elapsed = time.perf_counter() - start
+
+    events = sorted((v.id, v.direction, v.lane, v.name) for d in ("in", "out") for v in processor.analyzer.data[d])
+    counts = {
+        "in": dict(processor.analyzer.vehicle_in),
+        "out": dict(processor.analyzer.vehicle_out),
+    }
+    if processor.stride_controller is not None:
+        keyframes = processor.stride_controller.stats()["keyframes"]
+    else:
+        keyframes = processor.current_frame
+    return elapsed, counts, events, keyframes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default="assets/short.mp4")
+    parser.add_argument("--lanes", required=True)
+    parser.add_argument("--model", default="zabir.pt")
+    parser.add_argument("--strides", type=int, nargs="*", default=[2, 4], help="Fixed strides to compare")
+    parser.add_argument("--max-stride", type=int, default=6, help="Cap of the adaptive run")
+    args = parser.parse_args()
+
+    processor = VideoProcessor(args.model)
+    runs = [("every frame", 1, 1)] + [(f"fixed {k}", k, k) for k in args.strides]
+    runs.append((f"adaptive 1-{args.max_stride}", 1, args.max_stride))
+
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for label, min_stride, max_stride in runs:
+            results.append((label, *run(processor, args.video, args.lanes, min_stride, max_stride, output_dir)))
+
+    frames = processor.current_frame
+    _, base_time, base_counts, base_events, _ = results[0]
+    base_set = set(base_events)
+    for label, elapsed, counts, events, keyframes in results:
+        recall = len(base_set & set(events)) / len(base_set) if base_set else 1.0
+        print(f"{label:>14}: {elapsed:6.1f}s  speedup {base_time / elapsed:.2f}x  "
+              f"detector on {keyframes}/{frames} frames  counts match: {counts == base_counts}  "
+              f"events {len(events)} (baseline recall {recall:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Inference backends on CPU: frames/sec and whether counts and crossing events match PyTorch.
+
+Usage (from the repository root):
+    python -m benchmarks.backends --video assets/short.mp4 --lanes lanes.json --backends pytorch onnx openvino openvino-int8
+
+The first backend listed is the reference. Exports are built (once) before timing starts and
+every run bypasses the detection cache so each one really runs the detector.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from Lane import load_lanes
+from ModelBackend import ensure_exported
+from VideoProcessor import VideoProcessor
+
+
+def parse_backend(name):
+    backend, _, precision = name.partition("-")
+    return backend, precision == "int8"
+
+
+def run(model_path, name, video, lanes_path, output_dir):
+    backend, int8 = parse_backend(name)
+    processor = VideoProcessor(model_path, backend=backend, int8=int8)
+    processor.analyzer.lanes = load_lanes(lanes_path)
+    processor.source = video
+    processor.use_cache = False
+    processor.output_path = os.path.join(output_dir, f"{name}.mp4")
+    processor.event_log_path = os.path.join(output_dir, f"{name}.txt")
+
+    start = time.perf_counter()
+    processor.predict()
+    elapsed = time.perf_counter() - start
+
+    events = sorted((v.id, v.direction, v.lane, v.name) for d in ("in", "out") for v in processor.analyzer.data[d])
+    counts = {
+        "in": dict(processor.analyzer.vehicle_in),
+        "out": dict(processor.analyzer.vehicle_out),
+    }
+    return processor.current_frame / elapsed if elapsed > 0 else 0.0, counts, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default="assets/short.mp4")
+    parser.add_argument("--lanes", required=True)
+    parser.add_argument("--model", default="zabir.pt")
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "onnx", "openvino"],
+                        help="Backends to compare, e.g. pytorch onnx openvino openvino-int8")
+    args = parser.parse_args()
+
+    for name in args.backends:
+        ensure_exported(args.model, *parse_backend(name))
+
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name in args.backends:
+            results.append((name, *run(args.model, name, args.video, args.lanes, output_dir)))
+
+    _, base_fps, base_counts, base_events = results[0]
+    base_set = set(base_events)
+    for name, fps, counts, events in results:
+        # Track IDs can be numbered differently, so events are compared by direction, lane and class too
+        shared = len(base_set & set(events)) / len(base_set) if base_set else 1.0
+        print(f"{name:>14}: {fps:6.2f} FPS  ({fps / base_fps:.2f}x)  counts match: {counts == base_counts}  "
+              f"events {len(events)} ({shared:.0%} identical to {results[0][0]})")
+
+
+if __name__ == "__main__":
+    main()
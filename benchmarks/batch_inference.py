@@ -0,0 +1,73 @@
+"""
+Frames/sec of YOLO tracking at different batch sizes on CPU.
+
+Usage (from the repository root):
+    python -m benchmarks.batch_inference --video assets/short.mp4 --frames 120 --sizes 1 2 4 8
+
+Every batch size gets a fresh model so each run starts with an empty tracker. Track IDs of
+every frame are compared against the first size listed (1 by default) to confirm batching
+does not change tracking.
+"""
+import argparse
+import time
+
+import cv2
+from ultralytics import YOLO
+
+from Detections import Detections
+
+CLASSES = [1, 2, 3, 5, 6, 7]
+
+
+def read_frames(path, limit):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def run(model_path, frames, batch_size, device):
+    model = YOLO(model_path)
+    # Warm-up on a throwaway model so the timed run does not pay for lazy initialisation
+    YOLO(model_path).predict(frames[:1], device=device, verbose=False)
+
+    track_ids = []
+    start = time.perf_counter()
+    for i in range(0, len(frames), batch_size):
+        batch = frames[i:i + batch_size]
+        results = model.track(batch, persist=True, classes=CLASSES, device=device, verbose=False)
+        for result in results:
+            detections = Detections.from_result(result)
+            track_ids.append(detections.track_ids if detections is not None else [])
+    elapsed = time.perf_counter() - start
+    return len(frames) / elapsed, track_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default="assets/short.mp4")
+    parser.add_argument("--model", default="zabir.pt")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--device", default="cpu")
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.frames)
+    print(f"{len(frames)} frames from {args.video}, device={args.device}")
+
+    baseline = None
+    for batch_size in args.sizes:
+        fps, track_ids = run(args.model, frames, batch_size, args.device)
+        if baseline is None:
+            baseline = track_ids
+        same = sum(a == b for a, b in zip(baseline, track_ids))
+        print(f"batch={batch_size:<3} {fps:8.2f} FPS  track IDs identical on {same}/{len(frames)} frames")
+
+
+if __name__ == "__main__":
+    main()
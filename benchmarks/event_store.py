@@ -0,0 +1,108 @@
+"""
+SQLite event store: insert throughput through EventStore's batched transactions, and latency of
+the aggregate queries (counts per lane per time bucket, speed percentiles per class) once the
+table holds millions of events, against the same aggregates computed from the raw events table.
+
+Usage (from the repository root):
+    python -m benchmarks.event_store --events 2000000 --db runs/bench/events.sqlite
+
+Needs no model or video; events are synthetic, spread over several sources, lanes and classes.
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from EventStore import EventStore, counts_per_lane, speed_percentiles
+from utils import Vehicle
+
+NAMES = ["bicycle", "car", "motorcycle", "bus", "train", "truck"]
+
+
+def fill(path, events, sources, fps=30, chunk=100000):
+    rng = np.random.default_rng(0)
+    per_source = events // sources
+    inserted = 0
+    start = time.perf_counter()
+    for s in range(sources):
+        store = EventStore(path, f"cam{s}", fps=fps, batch_size=1000)
+        for offset in range(0, per_source, chunk):
+            n = min(chunk, per_source - offset)
+            lanes = rng.integers(1, 5, n)
+            classes = rng.integers(0, len(NAMES), n)
+            speeds = np.clip(rng.normal(40, 12, n), 1, None).astype(int)
+            # About one crossing every 2 frames, i.e. a busy road around the clock
+            frames = (offset + np.arange(n)) * 2
+            for i in range(n):
+                store.write(Vehicle(id=offset + i, velocity=f"{speeds[i]} km/h",
+                                    direction="in" if lanes[i] <= 2 else "out", name=NAMES[classes[i]],
+                                    lane=int(lanes[i]), speed=float(speeds[i]), frame=int(frames[i]),
+                                    recorded_at=0.0))
+        store.close()
+        inserted += per_source
+    return inserted, time.perf_counter() - start
+
+
+def raw_counts(connection, bucket_seconds, source=None):
+    where, params = ("WHERE source = ?", [source]) if source is not None else ("", [])
+    return connection.execute(
+        f"SELECT lane, direction, CAST(time / ? AS INTEGER) * ? AS bucket, COUNT(*) FROM events {where} "
+        f"GROUP BY lane, direction, bucket ORDER BY lane, direction, bucket",
+        [bucket_seconds, bucket_seconds] + params).fetchall()
+
+
+def raw_percentiles(connection, percentiles=(50, 85, 95)):
+    result = {}
+    for (name,) in connection.execute("SELECT DISTINCT class FROM events").fetchall():
+        speeds = [row[0] for row in connection.execute(
+            "SELECT speed FROM events WHERE class = ? ORDER BY speed", (name,))]
+        result[name] = {p: int(speeds[max(1, -(-p * len(speeds) // 100)) - 1]) for p in percentiles}
+    return result
+
+
+def timed(function, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000000)
+    parser.add_argument("--sources", type=int, default=4)
+    parser.add_argument("--db", default="runs/bench/events.sqlite")
+    args = parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+
+    inserted, seconds = fill(args.db, args.events, args.sources)
+    print(f"inserted {inserted} events in {seconds:.1f}s: {inserted / seconds:,.0f} events/s")
+
+    connection = sqlite3.connect(args.db)
+    connection.execute("ANALYZE")
+    queries = [
+        ("counts per lane per 15 min, one source", lambda: counts_per_lane(connection, 900, source="cam0"),
+         lambda: raw_counts(connection, 900, source="cam0")),
+        ("counts per lane per hour, all sources", lambda: counts_per_lane(connection, 3600),
+         lambda: raw_counts(connection, 3600)),
+        ("speed p50/p85/p95 per class", lambda: speed_percentiles(connection), lambda: raw_percentiles(connection)),
+    ]
+    for name, rollup, raw in queries:
+        fast, fast_ms = timed(rollup)
+        slow, slow_ms = timed(raw, repeat=1)
+        match = "match" if fast == slow else "MISMATCH"
+        print(f"{name:<40} rollup {fast_ms:8.1f} ms   raw events {slow_ms:8.1f} ms   ({match})")
+    rows, ms = timed(lambda: counts_per_lane(connection, 900, source="cam0", start=3600, end=7200))
+    print(f"{'counts per lane per 15 min, one hour':<40} rollup {ms:8.1f} ms   ({len(rows)} rows)")
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cost of the static HUD (lane lines and in/out count panels) per frame: drawn directly with
+cv2.line / cv2.putText, against the cached HudOverlay layers.
+
+Usage (from the repository root):
+    python -m benchmarks.hud_overlay --sizes 1280x720 1920x1080 3840x2160 --frames 300
+
+Needs no model or video. Counts change every 30 frames, as when a vehicle crosses, so the
+cached path includes its occasional re-render of a count row.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from HudOverlay import HudOverlay
+from Lane import Lane
+from utils import StreamAnalyzer
+
+CLASSES = ["car", "motorcycle", "bus", "truck", "bicycle"]
+
+
+def make_lanes(width, height, count=8):
+    lane_width = width // count
+    y = height // 2
+    lanes = [Lane(i * lane_width, lane_width - 10, "in" if i < count // 2 else "out", Lane.color(i), True, y=y + 1)
+             for i in range(count)]
+    lanes.append(Lane(0, width, "center", (65, 70, 84), True, y=y, name="crossing", thickness=10))
+    return lanes
+
+
+def run(width, height, frames, cached):
+    analyzer = StreamAnalyzer(make_lanes(width, height))
+    lane_lines = analyzer.lanes[:-1]
+    overlay = HudOverlay()
+    for i, name in enumerate(CLASSES):
+        analyzer.vehicle_in[name] = i + 1
+        analyzer.vehicle_out[name] = i + 2
+
+    img = np.zeros((height, width, 3), dtype=np.uint8)
+    start = time.perf_counter()
+    for frame in range(frames):
+        if frame % 30 == 0:
+            analyzer.vehicle_in[CLASSES[frame // 30 % len(CLASSES)]] += 1
+        if cached:
+            overlay.draw_lanes(img, lane_lines)
+            overlay.draw_panels(img, width, analyzer.vehicle_in, analyzer.vehicle_out)
+        else:
+            for lane in lane_lines:
+                lane.draw(img)
+            analyzer.show_in(img, width)
+            analyzer.show_out(img)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["1280x720", "1920x1080", "3840x2160"])
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split("x"))
+        direct = run(width, height, args.frames, cached=False)
+        cached = run(width, height, args.frames, cached=True)
+        print(f"{size:>10}: direct {direct:6.3f} ms/frame, cached {cached:6.3f} ms/frame, {direct / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Speed / count-accuracy tradeoff of the inference resolution, to pick a size per camera.
+
+Usage (from the repository root):
+    python -m benchmarks.inference_size --video recordings/cam1.mp4 --lanes cam1.json --sizes 1280 960 640 480
+
+Full resolution is always run first as the reference. Every run bypasses the detection cache
+so each one really runs the detector; annotation and the saved video stay at full resolution.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from Lane import load_lanes
+from VideoProcessor import VideoProcessor
+
+
+def run(processor, video, lanes_path, size, output_dir):
+    processor.analyzer.lanes = load_lanes(lanes_path)
+    processor.source = video
+    processor.use_cache = False
+    processor.inference_size = size
+    processor.output_path = os.path.join(output_dir, f"size_{size}.mp4")
+    processor.event_log_path = os.path.join(output_dir, f"size_{size}.txt")
+
+    start = time.perf_counter()
+    processor.predict()
+    elapsed = time.perf_counter() - start
+
+    counts = {}
+    for direction, vehicles in (("in", processor.analyzer.vehicle_in), ("out", processor.analyzer.vehicle_out)):
+        for name, count in vehicles.items():
+            counts[(direction, name)] = count
+    inference = processor.stage_stats.get("inference", {})
+    return elapsed, counts, inference.get("busy_s", 0.0)
+
+
+def count_error(counts, reference):
+    """
+    Sum of absolute per-class, per-direction count differences, relative to the reference total.
+    """
+    keys = set(counts) | set(reference)
+    error = sum(abs(counts.get(k, 0) - reference.get(k, 0)) for k in keys)
+    total = sum(reference.values())
+    return error, error / total if total else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default="assets/short.mp4")
+    parser.add_argument("--lanes", required=True)
+    parser.add_argument("--model", default="zabir.pt")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1280, 960, 640, 480])
+    args = parser.parse_args()
+
+    processor = VideoProcessor(args.model)
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for size in [None] + args.sizes:
+            results.append((size, *run(processor, args.video, args.lanes, size, output_dir)))
+
+    frames = processor.current_frame
+    _, base_time, base_counts, _ = results[0]
+    print(f"{'size':>6} {'FPS':>8} {'speedup':>8} {'detector s':>11} {'count error':>12}")
+    for size, elapsed, counts, busy in results:
+        error, relative = count_error(counts, base_counts)
+        print(f"{size or 'full':>6} {frames / elapsed:>8.2f} {base_time / elapsed:>7.2f}x {busy:>11.1f} "
+              f"{error:>5} ({relative:>5.1%})")
+
+
+if __name__ == "__main__":
+    main()
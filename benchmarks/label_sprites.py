@@ -0,0 +1,73 @@
+"""
+Annotation time per box: UI_box drawing its label badge directly (draw_border + putText) against
+blending the cached LabelSpriteCache sprite, with the box outline itself timed separately.
+
+Usage (from the repository root):
+    python -m benchmarks.label_sprites --tracks 20 --frames 300 --lifetime 60
+
+Needs no model or video. Tracks keep their ID and class for --lifetime frames before being
+replaced by a new one, so the cache sees the same mix of hits and misses as real traffic.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from Sprites import LabelSpriteCache
+from utils import UI_box, compute_color_for_labels
+
+NAMES = {1: "bicycle", 2: "car", 3: "motorcycle", 5: "bus", 6: "train", 7: "truck"}
+
+
+def make_frames(rng, frames, tracks, lifetime, width=1920, height=1080):
+    """
+    Per frame: a list of (box, label, color), tracks moving down the frame and replaced every lifetime frames.
+    """
+    result = []
+    state = {}
+    next_id = 1
+    for frame in range(frames):
+        for slot in range(tracks):
+            if slot not in state or (frame + slot) % lifetime == 0:
+                cls = int(rng.choice(list(NAMES)))
+                state[slot] = [next_id, cls, int(rng.integers(0, width - 120)), int(rng.integers(40, height - 200))]
+                next_id += 1
+            state[slot][3] += 3
+        result.append([((x, y, x + 110, y + 80), f"{track_id}:{NAMES[cls]}", compute_color_for_labels(cls))
+                       for track_id, cls, x, y in state.values()])
+    return result
+
+
+def run(frames, sprites, labels=True, width=1920, height=1080):
+    img = np.zeros((height, width, 3), dtype=np.uint8)
+    boxes = 0
+    start = time.perf_counter()
+    for frame in frames:
+        for box, label, color in frame:
+            UI_box(box, img, label=label if labels else None, color=color, line_thickness=2, sprites=sprites)
+        boxes += len(frame)
+    return (time.perf_counter() - start) / boxes * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracks", type=int, default=20, help="Boxes per frame")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--lifetime", type=int, default=60, help="Frames a track keeps its label")
+    parser.add_argument("--capacity", type=int, default=512, help="Sprites kept by the LRU cache")
+    args = parser.parse_args()
+
+    frames = make_frames(np.random.default_rng(0), args.frames, args.tracks, args.lifetime)
+    # The box outline is drawn the same way in both modes; subtracting it isolates the label badge
+    outline = run(frames, None, labels=False)
+    direct = run(frames, None)
+    sprites = LabelSpriteCache(args.capacity)
+    cached = run(frames, sprites)
+    print(f"box outline alone: {outline:6.1f} us/box")
+    print(f"direct labels:     {direct:6.1f} us/box (badge {direct - outline:5.1f} us)")
+    print(f"cached labels:     {cached:6.1f} us/box (badge {cached - outline:5.1f} us, "
+          f"{(direct - outline) / max(cached - outline, 1e-9):.1f}x)  {sprites.stats()}")
+
+
+if __name__ == "__main__":
+    main()
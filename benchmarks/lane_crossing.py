@@ -0,0 +1,99 @@
+"""
+Crossing / lane assignment per frame: the per-object intersect() loop against the vectorized
+intersect_many() + LaneIndex path used by draw_boxes, at 50 and 200 tracks per frame.
+
+Usage (from the repository root):
+    python -m benchmarks.lane_crossing --tracks 50 200 --lanes 8 --frames 2000
+
+Needs no model or video: tracks are random points around the crossing line. Both paths must
+assign every track to the same lane, which is checked before timing.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from Lane import Lane
+from utils import LaneIndex, get_direction, intersect, intersect_many
+
+
+def make_lanes(count, width=1920, y=540):
+    lane_width = width // count
+    lanes = [Lane(i * lane_width, lane_width - 10, "in" if i < count // 2 else "out", Lane.color(i % 8), True, y=y + 1)
+             for i in range(count)]
+    lanes.append(Lane(0, width, "center", (65, 70, 84), True, y=y, name="crossing", thickness=10))
+    return lanes
+
+
+def make_frames(rng, frames, tracks, width=1920, y=540):
+    current = np.stack([rng.integers(0, width, (frames, tracks)), rng.integers(y - 60, y + 60, (frames, tracks))], axis=2)
+    previous = current + rng.integers(-25, 26, current.shape)
+    return current.astype(np.int64), previous.astype(np.int64)
+
+
+def per_object(current, previous, ids, active, lane_lines, crossing):
+    """
+    The original draw_boxes logic: list-membership pruning, then intersect() per track and per lane.
+    """
+    pruned = [key for key in active if key not in ids]
+    lanes = []
+    for A, B in zip(current.tolist(), previous.tolist()):
+        lane_number = 0
+        if intersect(A, B, crossing.start(), crossing.end()):
+            direction = get_direction(A, B)
+            for idx, lane in enumerate(lane_lines):
+                if intersect(A, B, lane.start(), lane.end()) and lane.direction in direction:
+                    lane_number = idx + 1
+                    break
+        lanes.append(lane_number)
+    return pruned, lanes
+
+
+def vectorized(current, previous, ids, active, index, crossing):
+    """
+    The draw_boxes path: set pruning, one intersect_many() for the crossing, LaneIndex for the lanes.
+    """
+    id_set = set(ids)
+    pruned = [key for key in active if key not in id_set]
+    crossed = intersect_many(current, previous, crossing.start_x, crossing.start_x + crossing.width, crossing.y)[:, 0]
+    lanes = np.zeros(len(current), dtype=np.int64)
+    if crossed.any():
+        lanes[crossed] = index.assign(current[crossed], previous[crossed]) + 1
+    return pruned, lanes.tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracks", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--lanes", type=int, default=8)
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    lanes = make_lanes(args.lanes)
+    lane_lines, crossing = lanes[:-1], lanes[-1]
+    index = LaneIndex(lane_lines)
+    rng = np.random.default_rng(0)
+
+    for tracks in args.tracks:
+        current, previous = make_frames(rng, args.frames, tracks)
+        ids = list(range(tracks))
+        active = list(range(tracks // 2, tracks + tracks // 2))  # Half of the buffered tracks were lost
+
+        for f in range(args.frames):
+            assert per_object(current[f], previous[f], ids, active, lane_lines, crossing) == \
+                   vectorized(current[f], previous[f], ids, active, index, crossing), f"mismatch in frame {f}"
+
+        timings = {}
+        for name, step, lanes_arg in (("per-object", per_object, lane_lines), ("vectorized", vectorized, index)):
+            start = time.perf_counter()
+            for f in range(args.frames):
+                step(current[f], previous[f], ids, active, lanes_arg, crossing)
+            timings[name] = (time.perf_counter() - start) / args.frames * 1e6
+
+        print(f"{tracks:>4} tracks, {args.lanes} lanes: per-object {timings['per-object']:8.1f} us/frame, "
+              f"vectorized {timings['vectorized']:8.1f} us/frame, "
+              f"{timings['per-object'] / timings['vectorized']:.1f}x (results identical)")
+
+
+if __name__ == "__main__":
+    main()
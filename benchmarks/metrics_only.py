@@ -0,0 +1,69 @@
+"""
+Full (annotated video) versus metrics-only processing: time, FPS and whether the events agree.
+A third run renders only every --render-every frames, the sampled middle ground.
+
+Usage (from the repository root):
+    python -m benchmarks.metrics_only --video assets/short.mp4 --lanes lanes.json --render-every 30
+
+A first untimed run fills the detection cache and every timed run replays it, so all modes see
+the same detections and the timings differ only by drawing and encoding.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from Lane import load_lanes
+from VideoProcessor import VideoProcessor
+
+
+def run(processor, video, lanes_path, name, output_dir, cache_dir, metrics_only=False, render_every=None):
+    processor.analyzer.lanes = load_lanes(lanes_path)
+    processor.source = video
+    processor.cache_dir = cache_dir
+    processor.metrics_only = metrics_only
+    processor.render_every = render_every
+    processor.output_path = os.path.join(output_dir, f"{name}.mp4")
+    processor.event_log_path = os.path.join(output_dir, f"{name}.txt")
+
+    start = time.perf_counter()
+    processor.predict()
+    elapsed = time.perf_counter() - start
+
+    events = [(v.id, v.velocity, v.direction, v.lane, v.name, v.frame)
+              for d in ("in", "out") for v in processor.analyzer.data[d]]
+    with open(processor.event_log_path) as f:
+        log = f.read()
+    written = os.path.exists(processor.output_path) and os.path.getsize(processor.output_path) > 0
+    return elapsed, events, log, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default="assets/short.mp4")
+    parser.add_argument("--lanes", required=True)
+    parser.add_argument("--model", default="zabir.pt")
+    parser.add_argument("--render-every", type=int, default=30)
+    args = parser.parse_args()
+
+    processor = VideoProcessor(args.model)
+    with tempfile.TemporaryDirectory() as output_dir:
+        cache_dir = os.path.join(output_dir, "cache")
+        run(processor, args.video, args.lanes, "warmup", output_dir, cache_dir)
+        results = {
+            "full": run(processor, args.video, args.lanes, "full", output_dir, cache_dir),
+            "metrics-only": run(processor, args.video, args.lanes, "metrics", output_dir, cache_dir,
+                                metrics_only=True),
+            f"every {args.render_every}": run(processor, args.video, args.lanes, "sampled", output_dir, cache_dir,
+                                              metrics_only=True, render_every=args.render_every),
+        }
+
+    frames = processor.current_frame
+    full_time, full_events, full_log, _ = results["full"]
+    for name, (elapsed, events, log, written) in results.items():
+        print(f"{name:<14} {elapsed:6.2f}s  {frames / elapsed:7.1f} FPS  speedup {full_time / elapsed:5.2f}x  "
+              f"video written: {written}  events: {len(events)}, identical: {events == full_events and log == full_log}")
+
+
+if __name__ == "__main__":
+    main()
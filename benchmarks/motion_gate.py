@@ -0,0 +1,62 @@
+"""
+Motion-gated versus ungated processing: skipped frames, time and whether the counts agree.
+
+Usage (from the repository root):
+    python -m benchmarks.motion_gate --video assets/short.mp4 --lanes lanes.json --sensitivity 0.002
+
+Both runs bypass the detection cache so each one really runs the detector.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from Lane import load_lanes
+from VideoProcessor import VideoProcessor
+
+
+def run(processor, video, lanes_path, gated, sensitivity, output_dir):
+    processor.analyzer.lanes = load_lanes(lanes_path)
+    processor.source = video
+    processor.use_cache = False
+    processor.motion_gating = gated
+    processor.motion_sensitivity = sensitivity
+    processor.output_path = os.path.join(output_dir, f"gated_{gated}.mp4")
+    processor.event_log_path = os.path.join(output_dir, f"gated_{gated}.txt")
+
+    start = time.perf_counter()
+    processor.predict()
+    elapsed = time.perf_counter() - start
+
+    events = sorted((v.id, v.direction, v.lane, v.name) for d in ("in", "out") for v in processor.analyzer.data[d])
+    counts = {
+        "in": dict(processor.analyzer.vehicle_in),
+        "out": dict(processor.analyzer.vehicle_out),
+    }
+    skipped = processor.gate.stats()["skipped"] if processor.gate is not None else 0
+    return elapsed, counts, events, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default="assets/short.mp4")
+    parser.add_argument("--lanes", required=True)
+    parser.add_argument("--model", default="zabir.pt")
+    parser.add_argument("--sensitivity", type=float, default=0.002)
+    args = parser.parse_args()
+
+    processor = VideoProcessor(args.model)
+    with tempfile.TemporaryDirectory() as output_dir:
+        base_time, base_counts, base_events, _ = run(processor, args.video, args.lanes, False, args.sensitivity, output_dir)
+        gate_time, gate_counts, gate_events, skipped = run(processor, args.video, args.lanes, True, args.sensitivity,
+                                                           output_dir)
+
+    frames = processor.current_frame
+    print(f"ungated: {base_time:.1f}s  counts={base_counts}")
+    print(f"gated:   {gate_time:.1f}s  counts={gate_counts}  skipped {skipped}/{frames} frames")
+    print(f"speedup {base_time / gate_time:.2f}x, counts match: {base_counts == gate_counts}, "
+          f"events match: {base_events == gate_events}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Burned-in annotated video versus a sidecar overlay track: processing time, output size, and
+how long the player needs to look up a frame's overlay after a seek.
+
+Usage (from the repository root):
+    python -m benchmarks.overlay_track --video assets/short.mp4 --lanes lanes.json
+
+A first untimed run fills the detection cache and both timed runs replay it, so the timings
+differ only by drawing and encoding versus recording the overlay.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from Lane import load_lanes
+from OverlayTrack import OverlayTrack
+from VideoProcessor import VideoProcessor
+
+
+def run(processor, video, lanes_path, name, output_dir, cache_dir, overlay_track):
+    processor.analyzer.lanes = load_lanes(lanes_path)
+    processor.source = video
+    processor.cache_dir = cache_dir
+    processor.overlay_track = overlay_track
+    processor.output_path = os.path.join(output_dir, f"{name}.mp4")
+    processor.event_log_path = os.path.join(output_dir, f"{name}.txt")
+
+    start = time.perf_counter()
+    processor.predict()
+    elapsed = time.perf_counter() - start
+
+    output = processor.overlay_track_path() if overlay_track else processor.output_path
+    with open(processor.event_log_path) as f:
+        log = f.read()
+    return elapsed, os.path.getsize(output), output, log
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default="assets/short.mp4")
+    parser.add_argument("--lanes", required=True)
+    parser.add_argument("--model", default="zabir.pt")
+    parser.add_argument("--seeks", type=int, default=10000)
+    args = parser.parse_args()
+
+    processor = VideoProcessor(args.model)
+    with tempfile.TemporaryDirectory() as output_dir:
+        cache_dir = os.path.join(output_dir, "cache")
+        run(processor, args.video, args.lanes, "warmup", output_dir, cache_dir, False)
+        video_time, video_size, _, video_log = run(processor, args.video, args.lanes, "burned", output_dir,
+                                                   cache_dir, False)
+        overlay_time, overlay_size, overlay_file, overlay_log = run(processor, args.video, args.lanes, "overlay",
+                                                                    output_dir, cache_dir, True)
+
+        start = time.perf_counter()
+        track = OverlayTrack.load(overlay_file)
+        load_time = time.perf_counter() - start
+        targets = np.random.default_rng(0).integers(1, track.last_frame + 1, args.seeks).tolist()
+        start = time.perf_counter()
+        for frame_index in targets:
+            track.frame(frame_index), track.trails(frame_index), track.blinking(frame_index), track.counts(frame_index)
+        seek_time = (time.perf_counter() - start) / args.seeks
+
+    frames = processor.current_frame
+    print(f"burned-in video: {video_time:6.2f}s  {frames / video_time:7.1f} FPS  {video_size / 1e6:8.2f} MB")
+    print(f"overlay track:   {overlay_time:6.2f}s  {frames / overlay_time:7.1f} FPS  {overlay_size / 1e6:8.3f} MB  "
+          f"speedup {video_time / overlay_time:.2f}x, events identical: {video_log == overlay_log}")
+    print(f"overlay load {load_time * 1000:.1f} ms, random seek + lookup {seek_time * 1e6:.1f} us per frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Cost of the live preview on processing throughput: a run without preview against runs that
+publish into a LatestFrame read by a simulated GUI, one keeping up and one far too slow.
+
+Usage (from the repository root):
+    python -m benchmarks.preview --video assets/short.mp4 --lanes lanes.json --preview-fps 10
+
+A first untimed run fills the detection cache and every timed run replays it. The slow GUI
+takes a frame only every 500 ms; the preview then drops frames instead of holding up processing.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from Lane import load_lanes
+from Preview import LatestFrame
+from VideoProcessor import VideoProcessor
+
+
+def gui(preview, period, stop, shown):
+    # Stand-in for the GUI timer: takes whatever is newest every period seconds
+    while not stop.is_set():
+        if preview.take() is not None:
+            shown.append(time.perf_counter())
+        stop.wait(period)
+
+
+def run(processor, video, lanes_path, name, output_dir, cache_dir, preview=None, period=None):
+    processor.analyzer.lanes = load_lanes(lanes_path)
+    processor.source = video
+    processor.cache_dir = cache_dir
+    processor.preview = preview
+    processor.output_path = os.path.join(output_dir, f"{name}.mp4")
+    processor.event_log_path = os.path.join(output_dir, f"{name}.txt")
+
+    stop, shown = threading.Event(), []
+    consumer = None
+    if preview is not None:
+        consumer = threading.Thread(target=gui, args=(preview, period, stop, shown), daemon=True)
+        consumer.start()
+    start = time.perf_counter()
+    processor.predict()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    if consumer is not None:
+        consumer.join()
+    return elapsed, len(shown), preview.stats() if preview is not None else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default="assets/short.mp4")
+    parser.add_argument("--lanes", required=True)
+    parser.add_argument("--model", default="zabir.pt")
+    parser.add_argument("--preview-fps", type=float, default=10)
+    args = parser.parse_args()
+
+    processor = VideoProcessor(args.model)
+    with tempfile.TemporaryDirectory() as output_dir:
+        cache_dir = os.path.join(output_dir, "cache")
+        run(processor, args.video, args.lanes, "warmup", output_dir, cache_dir)
+        results = {
+            "no preview": run(processor, args.video, args.lanes, "plain", output_dir, cache_dir),
+            "GUI at 20 Hz": run(processor, args.video, args.lanes, "fast", output_dir, cache_dir,
+                                LatestFrame(args.preview_fps, size=(960, 540)), 0.05),
+            "GUI at 2 Hz": run(processor, args.video, args.lanes, "slow", output_dir, cache_dir,
+                               LatestFrame(args.preview_fps, size=(960, 540)), 0.5),
+        }
+
+    frames = processor.current_frame
+    base = results["no preview"][0]
+    for name, (elapsed, shown, stats) in results.items():
+        print(f"{name:<13} {elapsed:6.2f}s  {frames / elapsed:7.1f} FPS  ({elapsed / base - 1:+6.1%})  "
+              f"shown {shown}  {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Per-frame cost of progress reporting in the frame loop: the previous print + signal on every
+frame against ProgressTracker (one clock read per frame, coalesced reports) with the per-frame
+diagnostics at DEBUG level.
+
+Usage (from the repository root):
+    python -m benchmarks.progress --frames 200000
+
+Needs no model, video or Qt. The cross-thread Qt signal is stood in for by a queue drained by
+a consumer thread, which is how a queued connection delivers it to the GUI's event loop.
+Terminal output goes to --stdout (default /dev/null); pass a tty path to include a real terminal.
+"""
+import argparse
+import contextlib
+import logging
+import os
+import queue
+import threading
+import time
+
+from Progress import ProgressTracker
+
+logger = logging.getLogger("benchmarks.progress")
+INTERVAL = 0.25  # VideoProcessor.progress_interval
+
+
+def consume(events, delivered):
+    while events.get() is not None:
+        delivered.append(1)
+
+
+def run(frames, report, stream):
+    events, delivered = queue.Queue(), []
+    consumer = threading.Thread(target=consume, args=(events, delivered), daemon=True)
+    consumer.start()
+    with contextlib.redirect_stdout(stream):
+        start = time.perf_counter()
+        report(frames, events)
+        elapsed = time.perf_counter() - start
+    events.put(None)
+    consumer.join()
+    return elapsed, len(delivered)
+
+
+def per_frame(frames, events):
+    # Previous behaviour: a signal and a print for every frame
+    for frame_index in range(1, frames + 1):
+        events.put(frame_index)
+        print(f"Processing frame: {frame_index}/{frames}")
+
+
+def coalesced(frames, events):
+    tracker = ProgressTracker(INTERVAL)
+    tracker.start(frames)
+    for frame_index in range(1, frames + 1):
+        progress = tracker.update(frame_index)
+        if progress is not None:
+            events.put(progress)
+        logger.debug("Processing frame: %d/%d", frame_index, frames)
+    events.put(tracker.finish(frames))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=200000)
+    parser.add_argument("--stdout", default=os.devnull)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    with open(args.stdout, "w") as stream:
+        old_time, old_delivered = run(args.frames, per_frame, stream)
+        new_time, new_delivered = run(args.frames, coalesced, stream)
+
+    print(f"{args.frames} frames")
+    print(f"print + signal per frame: {old_time / args.frames * 1e9:8.0f} ns/frame, "
+          f"{old_delivered} GUI events ({old_delivered / old_time:,.0f}/s)")
+    print(f"coalesced progress:       {new_time / args.frames * 1e9:8.0f} ns/frame, "
+          f"{new_delivered} GUI events (at most {1 / INTERVAL:.0f}/s)")
+    print(f"{old_time / new_time:.1f}x less time in the frame loop")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,18 @@
 from PyQt5 import QtWidgets
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 from PyQt5.QtMultimediaWidgets import QVideoWidget
-from PyQt5.QtCore import QUrl
+from PyQt5.QtCore import QUrl, QTimer
 import sys
 import os
+import logging
 from pathlib import Path
 from LaneAdjustment import LaneAdjustmentApp
 import cv2
-import utils
 from Predictor import Predictor
+from Preview import LatestFrame
 from VideoPlayer import VideoPlayer
 
+logger = logging.getLogger(__name__)
 source = 0
 output = "runs/detect"
 fileName = ""
@@ -25,8 +27,19 @@ class VideoProcessingApp(QtWidgets.QWidget):
         super().__init__()
 
         self.predictor = Predictor()
-        self.predictor.update_frame.connect(self.update_frame_progress)
+        # Boxes and counts go to a sidecar file drawn over the original video instead of a re-encode
+        self.predictor.overlay_track = True
+        self.predictor.progress_updated.connect(self.update_frame_progress)
         self.predictor.completed.connect(self.play_video)
+        self.predictor.segment_ready.connect(self.add_segment)
+
+        # Live preview: the predictor publishes into a single-slot buffer and a timer shows the newest frame
+        self.preview = LatestFrame(max_fps=10)
+        self.predictor.preview = self.preview
+        self.preview_timer = QTimer(self)
+        self.preview_timer.timeout.connect(self.show_preview)
+        self.segments = []
+        self.watching_partial = False
 
 
         self.lanes_list = None
@@ -52,6 +65,10 @@ class VideoProcessingApp(QtWidgets.QWidget):
         # start processin button
         self.start_processing = QtWidgets.QPushButton("Start")
         self.start_processing.clicked.connect(self.start_prediction)
+        # watch what has been processed so far / go back to the live preview
+        self.watch_button = QtWidgets.QPushButton("Watch Processed Part")
+        self.watch_button.clicked.connect(self.toggle_partial)
+        self.watch_button.setVisible(False)
 
         # Display the selected video path
         self.video_path_label = QtWidgets.QLabel(self.video)
@@ -63,6 +80,7 @@ class VideoProcessingApp(QtWidgets.QWidget):
 
         self.controls_layout.addWidget(self.upload_button)
         self.controls_layout.addWidget(self.video_path_label)
+        self.controls_layout.addWidget(self.watch_button)
 
         # Video Display
         self.video_widget = VideoPlayer()
@@ -84,28 +102,67 @@ class VideoProcessingApp(QtWidgets.QWidget):
         self.video_path = None
 
 
+    def show_preview(self):
+        """Shows the newest published frame; frames published in between were simply replaced."""
+        self.preview.size = self.video_widget.preview_size()
+        item = self.preview.take()
+        if item is not None and not self.watching_partial:
+            self.video_widget.show_preview(item[1])
+
+    def add_segment(self, path):
+        self.segments.append(path)
+
+    def toggle_partial(self):
+        """Switches between the live preview and playing back the part of the run already processed."""
+        if self.watching_partial:
+            self.watching_partial = False
+            self.watch_button.setText("Watch Processed Part")
+            self.video_widget.disable_buttons()
+            return
+        writer = self.predictor.overlay_writer
+        if writer is not None:
+            self.video_widget.play_video(str(Path(self.video_path).absolute()), overlay=writer.snapshot())
+        elif self.segments:
+            self.video_widget.play_segments(self.segments)
+        else:
+            return
+        self.watching_partial = True
+        self.watch_button.setText("Back to Live Preview")
+        self.video_widget.enable_buttons()
+
     def play_video(self):
+        self.preview_timer.stop()
+        self.watch_button.setVisible(False)
+        self.watching_partial = False
         if self.video_path:
             self.lane_button.setDisabled(False)
             # self.start_processing.setDisabled(False)
-            relativePath = "runs/detect/output.mp4"
-            video = str(Path(relativePath).absolute())
-            print("VIDEO IS ", video)
+            overlay = None
+            if self.predictor.overlay_track:
+                video = str(Path(self.video_path).absolute())
+                overlay = self.predictor.overlay_track_path()
+            elif self.segments:
+                self.video_widget.enable_buttons()
+                self.video_widget.play_segments(self.segments)
+                return
+            else:
+                relativePath = "runs/detect/output.mp4"
+                video = str(Path(relativePath).absolute())
+            logger.debug(f"Playing {video}")
             # self.player = QMediaPlayer()
             # media_content = QMediaContent(QUrl.fromLocalFile(video))
             # self.player.setMedia(media_content)
             # self.player.setVideoOutput(self.video_widget)
             # self.player.play()
             self.video_widget.enable_buttons()
-            self.video_widget.play_video(video)
+            self.video_widget.play_video(video, overlay=overlay)
 
         else:
             QtWidgets.QMessageBox.warning(self, "No Video Selected", "Please select a video to play.")
 
-    def update_frame_progress(self):
-        """Update the frame progress label dynamically."""
-        print("Updating")
-        self.frame_progress_label.setText(f"Frame: {self.predictor.current_frame}/{self.predictor.total_frames}")
+    def update_frame_progress(self, progress):
+        """Update the frame progress label; the predictor sends a few coalesced updates per second."""
+        self.frame_progress_label.setText(str(progress))
     def browse_video(self):
         global fileName, source
         self.video_widget.disable_buttons()
@@ -128,7 +185,7 @@ class VideoProcessingApp(QtWidgets.QWidget):
 
         # Check if the video was opened successfully
         if not cap.isOpened():
-            print("Error: Could not open video.")
+            logger.error("Error: Could not open video.")
             return
 
         # Read the first frame
@@ -140,25 +197,35 @@ class VideoProcessingApp(QtWidgets.QWidget):
             # Open the lane adjustment window and pass the first frame
             self.lane_adjustment_window = LaneAdjustmentApp(frame=self.frame)
             self.lane_adjustment_window.lanes_passed.connect(self.update_enabled_lanes)
+            self.lane_adjustment_window.calibration_passed.connect(self.update_calibration)
             self.lane_adjustment_window.show()
         else:
-            print("Error: Could not read the first frame.")
+            logger.error("Error: Could not read the first frame.")
+
+    def update_calibration(self, calibration):
+        self.predictor.analyzer.calibration = calibration
 
     def update_enabled_lanes(self, lanes_list):
-        utils.lanes = lanes_list
+        self.predictor.analyzer.lanes = lanes_list
         self.controls_layout.addWidget(self.start_processing)
     def start_prediction(self):
         if self.predictor.isRunning():
-            print("Prediction is already running!")
+            logger.warning("Prediction is already running!")
             return
         self.controls_layout.removeWidget(self.start_processing)
         self.start_processing.setVisible(False)
         self.lane_button.setDisabled(True)
         clear_data()
+        self.segments = []
+        self.watching_partial = False
+        self.watch_button.setText("Watch Processed Part")
+        self.watch_button.setVisible(self.predictor.can_play_partial())
+        self.preview_timer.start(50)
         self.predictor.start()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     app = QtWidgets.QApplication(sys.argv)
     window = VideoProcessingApp()
     window.show()
@@ -0,0 +1,94 @@
+"""
+Continuous processing of a live camera feed (or a looping file standing in for one).
+
+Usage:
+    python live.py rtsp://camera/stream --lanes lanes.json --policy drop_oldest
+    python live.py assets/short.mp4 --loop --lanes lanes.json --segment-seconds 30
+
+Runs until the stream ends or Ctrl+C. Output rolls into <output>_0000.mp4, <output>_0001.mp4, ...
+and events are appended to the event log as they happen (written out every --flush-seconds).
+"""
+import argparse
+import logging
+import os
+import threading
+
+from EventLog import FSYNC_POLICIES
+from Lane import load_calibration, load_lanes
+from LiveSource import DROP_POLICIES
+from ModelBackend import BACKENDS
+from TrackExport import EXPORT_FORMATS
+from VideoProcessor import VideoProcessor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Stream URL, camera index or video file")
+    parser.add_argument("--lanes", required=True, help="Lane configuration saved from the lane adjustment window")
+    parser.add_argument("--model", default="zabir.pt")
+    parser.add_argument("--backend", choices=BACKENDS, default="pytorch")
+    parser.add_argument("--int8", action="store_true", help="INT8-quantized model (openvino backend only)")
+    parser.add_argument("--inference-size", type=int, default=None,
+                        help="Longest side of the frames sent to the detector (default: full resolution)")
+    parser.add_argument("--output", default="runs/live/output.mp4")
+    parser.add_argument("--events", default="runs/live/data.txt")
+    parser.add_argument("--events-db", default=None, help="Also store events in this SQLite database")
+    parser.add_argument("--export-tracks", choices=EXPORT_FORMATS, default=None,
+                        help="Also write per-frame tracks and events as columnar files (needs pyarrow)")
+    parser.add_argument("--metrics-only", action="store_true",
+                        help="Track and count without drawing or encoding the output segments")
+    parser.add_argument("--render-every", type=int, default=None,
+                        help="With --metrics-only, still render every n-th frame into the output segments")
+    parser.add_argument("--loop", action="store_true", help="Replay a file forever at its own FPS")
+    parser.add_argument("--buffer-size", type=int, default=8)
+    parser.add_argument("--policy", choices=DROP_POLICIES, default="drop_oldest")
+    parser.add_argument("--drop-every", type=int, default=2, help="k for the drop_every_k policy")
+    parser.add_argument("--segment-seconds", type=float, default=60)
+    parser.add_argument("--flush-seconds", type=float, default=5.0, help="How often buffered events are appended")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="flush",
+                        help="Event log durability: fsync never, on close or after every flush")
+    parser.add_argument("--stats-seconds", type=float, default=10.0, help="How often to print drop/latency stats")
+    parser.add_argument("--log-level", choices=("DEBUG", "INFO", "WARNING", "ERROR"), default="INFO",
+                        help="DEBUG adds per-frame progress and crossing diagnostics")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level, format="%(message)s")
+
+    source = int(args.source) if args.source.isdigit() else args.source
+
+    processor = VideoProcessor(args.model, backend=args.backend, int8=args.int8)
+    processor.analyzer.lanes = load_lanes(args.lanes)
+    processor.analyzer.calibration = load_calibration(args.lanes)
+    processor.source = source
+    processor.live = True
+    processor.loop = args.loop
+    processor.inference_size = args.inference_size
+    processor.buffer_size = args.buffer_size
+    processor.drop_policy = args.policy
+    processor.drop_every = args.drop_every
+    processor.live_segment_seconds = args.segment_seconds
+    processor.log_flush_seconds = args.flush_seconds
+    processor.log_fsync = args.fsync
+    processor.output_path = args.output
+    processor.event_log_path = args.events
+    processor.event_store_path = args.events_db
+    processor.metrics_only = args.metrics_only
+    processor.render_every = args.render_every
+    if args.export_tracks is not None:
+        processor.track_export_dir = os.path.join(os.path.dirname(args.events) or ".", "tracks")
+        processor.track_export_format = args.export_tracks
+
+    worker = threading.Thread(target=processor.predict)
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(args.stats_seconds)
+            if worker.is_alive():
+                print(f"Live stats: {processor.stats()}")
+    except KeyboardInterrupt:
+        print("Stopping...")
+        processor.stop()
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
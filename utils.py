@@ -1,46 +1,45 @@
 # Ultralytics YOLO 🚀, GPL-3.0 license
 
-import math
+import logging
+import time
 from collections import deque
 import cv2
 import numpy as np
 from numpy import random
+
+from Calibration import fit_speeds
+from Counters import CrossingCounter
+from HudOverlay import HudOverlay, draw_panel_row, draw_panel_title
+from Sprites import LabelSpriteCache
 # from deep_sort_pytorch.deep_sort import DeepSort
 # from deep_sort_pytorch.utils.parser import get_config
-from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
 
 
-@dataclass
 class Vehicle:
-    id: int
-    velocity: str
-    direction: str
-    name: str
-    lane: int = 0
+    """
+    One counted crossing. __slots__ keeps each record small, since a stream can keep thousands.
+    """
+    __slots__ = ("id", "velocity", "direction", "name", "lane", "speed", "frame", "recorded_at")
+
+    def __init__(self, id, velocity, direction, name, lane=0, speed=0.0, frame=0, recorded_at=0.0):
+        self.id = id
+        self.velocity = velocity
+        self.direction = direction
+        self.name = name
+        self.lane = lane
+        self.speed = speed  # velocity as a number, km/h
+        self.frame = frame  # frame index the vehicle crossed on
+        self.recorded_at = recorded_at  # wall-clock time the event was recorded
+
+    def __repr__(self):
+        return (f"Vehicle(id={self.id}, velocity={self.velocity!r}, direction={self.direction!r}, "
+                f"name={self.name!r}, lane={self.lane})")
 
 
 palette = (2 ** 11 - 1, 2 ** 15 - 1, 2 ** 20 - 1)
-data_deque = {}
-data = {
-    "in": [],
-    "out": []
-}
-vehicle_in = {}
-vehicle_out = {}
-lanes = []
-
-
-def estimatespeed(Location1, Location2):
-    # Euclidean Distance Formula
-    d_pixel = math.sqrt(math.pow(Location2[0] - Location1[0], 2) + math.pow(Location2[1] - Location1[1], 2))
-    # defining thr pixels per meter
-    ppm = 8
-    d_meters = d_pixel / ppm
-    time_constant = 15 * 3.6
-    # distance = speed/time
-    speed = d_meters * time_constant
-
-    return int(speed)
+
 
 def compute_color_for_labels(label):
     """
@@ -90,19 +89,29 @@ def draw_border(img, pt1, pt2, color, thickness, r, d):
     return img
 
 
-def UI_box(x, img, color=None, label=None, line_thickness=None):
-    # Plots one bounding box on image img
+def draw_label(img, c1, label, color, tl):
+    # Label badge above the top-left corner c1 of a box
+    tf = max(tl - 1, 1)  # font thickness
+    t_size = cv2.getTextSize(label, 0, fontScale=tl / 3, thickness=tf)[0]
+
+    img = draw_border(img, (c1[0], c1[1] - t_size[1] - 3), (c1[0] + t_size[0], c1[1] + 3), color, 1, 8, 2)
+
+    cv2.putText(img, label, (c1[0], c1[1] - 2), 0, tl / 3, [225, 255, 255], thickness=tf, lineType=cv2.LINE_AA)
+
+
+def UI_box(x, img, color=None, label=None, line_thickness=None, sprites=None):
+    # Plots one bounding box on image img; with a LabelSpriteCache the label badge is a cached sprite
     tl = line_thickness or round(0.002 * (img.shape[0] + img.shape[1]) / 2) + 1  # line/font thickness
     color = color or [random.randint(0, 255) for _ in range(3)]
     c1, c2 = (int(x[0]), int(x[1])), (int(x[2]), int(x[3]))
     cv2.rectangle(img, c1, c2, color, thickness=tl, lineType=cv2.LINE_AA)
     if label:
-        tf = max(tl - 1, 1)  # font thickness
-        t_size = cv2.getTextSize(label, 0, fontScale=tl / 3, thickness=tf)[0]
-
-        img = draw_border(img, (c1[0], c1[1] - t_size[1] - 3), (c1[0] + t_size[0], c1[1] + 3), color, 1, 8, 2)
-
-        cv2.putText(img, label, (c1[0], c1[1] - 2), 0, tl / 3, [225, 255, 255], thickness=tf, lineType=cv2.LINE_AA)
+        if sprites is None:
+            draw_label(img, c1, label, color, tl)
+        else:
+            sprite, (dx, dy) = sprites.get(label, color, tl,
+                                           lambda canvas, origin: draw_label(canvas, origin, label, color, tl))
+            sprite.draw(img, c1[0] + dx, c1[1] + dy)
 
 
 # def intersect(A, B, C, D):
@@ -133,6 +142,72 @@ def intersect(A, B, C, D):
     return False
 
 
+def intersect_many(A, B, start_x, end_x, y):
+    """
+    Vectorized intersect(): A and B are (N, 2) arrays of current and previous points, the
+    horizontal line(s) run from start_x to end_x at height y (scalars, or (L,) arrays for an
+    (N, L) result). Same conditions as intersect(), so the results are identical.
+    """
+    ax, ay, bx, by = A[:, 0:1], A[:, 1:2], B[:, 0:1], B[:, 1:2]
+    start_x, end_x, y = np.atleast_1d(start_x), np.atleast_1d(end_x), np.atleast_1d(y)
+    vertical = (np.minimum(ay, by) <= y) & (y <= np.maximum(ay, by))
+    horizontal = (((start_x <= ax) & (ax <= end_x)) | ((start_x <= bx) & (bx <= end_x))
+                  | ((ax <= start_x) & (start_x <= bx)))
+    return vertical & horizontal
+
+
+class LaneIndex:
+    """
+    Lanes as interval arrays sorted by start_x, to find the lane crossed by many tracks at once.
+    Candidate lanes come from a binary search of each track's x-span; the candidates are then
+    checked with the exact intersect() and direction rules, and the first matching lane in
+    configuration order wins, as in the per-object loop.
+    """
+
+    # Direction strings produced by get_direction, by y sign (in, out, none) and x sign (right, left, none)
+    DIRECTIONS = [[y + x for x in ("right", "left", "")] for y in ("in", "out", "")]
+
+    def __init__(self, lanes):
+        self.key = LaneIndex.key_for(lanes)
+        starts = np.array([lane.start_x for lane in lanes], dtype=np.int64)
+        self.order = np.argsort(starts, kind="stable")
+        self.starts = starts[self.order]
+        self.ends = np.array([lane.start_x + lane.width for lane in lanes], dtype=np.int64)[self.order]
+        self.ys = np.array([lane.y for lane in lanes], dtype=np.int64)[self.order]
+        # Ends can only be binary searched when the sorted lanes do not overlap
+        self.ends_sorted = bool(np.all(np.diff(self.ends) >= 0))
+        # matches[lane, y sign, x sign]: the `lane.direction in direction` check of draw_boxes
+        self.matches = np.array([[[lanes[i].direction in d for d in row] for row in LaneIndex.DIRECTIONS]
+                                 for i in self.order], dtype=bool).reshape(len(lanes), 3, 3)
+
+    @staticmethod
+    def key_for(lanes):
+        return tuple((lane.start_x, lane.width, lane.y, lane.direction) for lane in lanes)
+
+    def assign(self, A, B):
+        """
+        Index (into the configured lane list) of the lane crossed from B to A for every row, or -1.
+        """
+        count = len(self.starts)
+        if count == 0 or len(A) == 0:
+            return np.full(len(A), -1, dtype=np.int64)
+
+        low = np.minimum(A[:, 0], B[:, 0])
+        high = np.maximum(A[:, 0], B[:, 0])
+        right = np.searchsorted(self.starts, high, side="right")  # Lanes starting at or before high
+        left = np.searchsorted(self.ends, low, side="left") if self.ends_sorted else np.zeros_like(right)
+        columns = np.arange(count)
+        candidates = (columns >= left[:, None]) & (columns < right[:, None])
+
+        y_sign = np.where(A[:, 1] > B[:, 1], 0, np.where(A[:, 1] < B[:, 1], 1, 2))
+        x_sign = np.where(A[:, 0] > B[:, 0], 0, np.where(A[:, 0] < B[:, 0], 1, 2))
+        hits = (candidates & intersect_many(A, B, self.starts, self.ends, self.ys)
+                & self.matches[:, y_sign, x_sign].T)
+
+        lane_index = np.where(hits, self.order[None, :], count).min(axis=1)
+        return np.where(lane_index == count, -1, lane_index)
+
+
 def get_direction(point1, point2):
     direction_str = ""
 
@@ -159,166 +234,221 @@ def get_direction(point1, point2):
     return direction_str
 
 
-def add_vehicle_in(vehicle: Vehicle):
-    if vehicle.name not in vehicle_in:
-        vehicle_in[vehicle.name] = [vehicle]
-    else:
-        vehicle_in[vehicle.name].append(vehicle)
-
-
-def add_vehicle_out(vehicle: Vehicle):
-    if vehicle.name not in vehicle_out:
-        vehicle_out[vehicle.name] = [vehicle]
-    else:
-        vehicle_out[vehicle.name].append(vehicle)
-
-
-def add_vehicle(id, velocity, direction, obj_name, lane):
-    vehicle = Vehicle(
-        id=id,
-        velocity=f"{velocity} km/h",
-        name=obj_name,
-        direction=direction,
-        lane=lane
-    )
-    if direction == "in":
-        add_vehicle_in(vehicle)
-    else:
-        add_vehicle_out(vehicle)
-
-    if not any(v.id == vehicle.id for v in data[vehicle.direction]):
-        data[vehicle.direction].append(vehicle)
-
-def draw_trail(id, img, color):
-    for i in range(1, len(data_deque[id])):
-        # Check if on buffer value is none
-        if data_deque[id][i - 1] is None or data_deque[id][i] is None:
-            continue
-        # Generate dynamic thickness of trails
-        thickness = int(np.sqrt(64 / float(i + i)) * 1.5)
-        # Draw trails
-        cv2.line(img, data_deque[id][i - 1], data_deque[id][i], color, thickness)
-
-
-def show_in(img, width):
-    """
-    Displays the number of vehicles leaving ("out") based on object_data dictionary.
-    """
-    for idx, (label, vehicles) in enumerate(vehicle_in.items()):
-        if vehicles is not None:
-            count = len(list(vehicles))
-            cnt_str = f"{label}: {count}"
-            cv2.line(img, (width - 500, 25), (width, 25), [85, 45, 255], 40)
-            cv2.putText(img, 'Number of Vehicles Entering', (width - 500, 35), 0, 1, [225, 255, 255], thickness=2,
-                        lineType=cv2.LINE_AA)
-            cv2.line(img, (width - 150, 65 + (idx * 40)), (width, 65 + (idx * 40)), [85, 45, 255], 30)
-            cv2.putText(img, cnt_str, (width - 150, 75 + (idx * 40)), 0, 1, [255, 255, 255], thickness=2,
-                        lineType=cv2.LINE_AA)
-
-
-def show_out(img):
+class StreamAnalyzer:
     """
-    Displays the number of vehicles entering ("in") based on object_data dictionary.
+    Tracking and counting state for one video stream: its lanes, per-track point buffers and
+    the in/out counters. Each stream gets its own analyzer, so several streams can be analyzed
+    in one process without sharing state.
     """
-    for idx, (label, vehicles) in enumerate(vehicle_out.items()):
-        if vehicles is not None:
-            count = len(list(vehicles))
-            cnt_str1 = f"{label}: {count}"
-            cv2.line(img, (20, 25), (500, 25), [85, 45, 255], 40)
-            cv2.putText(img, 'Number of Vehicles Leaving', (11, 35), 0, 1, [225, 255, 255], thickness=2,
-                        lineType=cv2.LINE_AA)
-            cv2.line(img, (20, 65 + (idx * 40)), (127, 65 + (idx * 40)), [85, 45, 255], 30)
-            cv2.putText(img, cnt_str1, (11, 75 + (idx * 40)), 0, 1, [225, 255, 255], thickness=2, lineType=cv2.LINE_AA)
-
-
-def draw_boxes(img, bbox, names, object_id, identities=None, offset=(0, 0)):
-    frame_height = img.shape[0]
-    lane_lines = lanes[:len(lanes) - 1]
-    crossing = lanes[-1]
-
-    # crossing.draw(img)
-    for lane in lane_lines:
-        lane.draw(img)
-
-    height, width, _ = img.shape
-    # Remove tracked point from buffer if object is lost
-    for key in list(data_deque):
-        if key not in identities:
-            data_deque.pop(key)
-
-    for i, box in enumerate(bbox):
-        x1, y1, x2, y2 = [int(i) for i in box]
-        x1 += offset[0]
-        x2 += offset[0]
-        y1 += offset[1]
-        y2 += offset[1]
-
-        # Code to find center of bottom edge
-        center = (int((x2 + x1) / 2), int((y2 + y2) / 2))
-
-        # Get ID of object
-        id = int(identities[i]) if identities is not None else 0
-
-        # Create new buffer for new object
-        if id not in data_deque:
-            data_deque[id] = deque(maxlen=64)
-        color = compute_color_for_labels(object_id[i])
-        obj_name = names[object_id[i]]  # Object label (e.g., "Car", "Bus")
-        label = '{}{:d}'.format("", id) + ":" + '%s' % (obj_name)
-
-        # Add center to buffer
-        data_deque[id].appendleft(center)
-        if len(data_deque[id]) >= 2:
-            direction = get_direction(data_deque[id][0], data_deque[id][1])
-            lane_dir = ""
-            if intersect(data_deque[id][0], data_deque[id][1], crossing.start(), crossing.end()):
-                # Determine which lane segment was crossed
-                lane_number = 0
-                for idx, lane in enumerate(lane_lines):
-                    # if id == 13 or id == 18 or id == 20:
-                    #     print(id, "DATA DEQUE ", data_deque[id][0], data_deque[id][1], lane.start(), lane.end(), intersect(data_deque[id][0], data_deque[id][1], lane.start(), lane.end() ))
-                    if intersect(data_deque[id][0], data_deque[id][1], lane.start(), lane.end()):
-
-                        if lane.direction in direction:
-                            print(lane.direction, direction, "Match", lane.direction in direction )
-                            lane_dir = lane.direction
-                            lane.blink(img)
-                            lane_number = idx + 1  # Lane numbers start at 1
-                            break
-
-                # Calculate velocity
-                velocity = estimatespeed(data_deque[id][1], data_deque[id][0])
-                if lane_number != 0:
-                    add_vehicle(id, velocity, lane_dir, obj_name, lane_number)
-
-        UI_box(box, img, label=label, color=color, line_thickness=2)
-        draw_trail(id, img, color)
-
-    show_in(img, width)
-    show_out(img)
 
-    return img
-
-
-# def write_to_file(vehicle: Vehicle):
-#     if vehicle.direction == "in":
-#
-#         with open('in.txt', 'a') as file:  # Open file in append mode
-#             file.write(
-#                 f"Object ID: {vehicle.id}, Velocity: {vehicle.velocity}, Direction: {vehicle.direction}, Lane: {vehicle.lane}, Label: {vehicle.name}\n")
-#     else:
-#         with open('out.txt', 'a') as file:  # Open file in append mode
-#             file.write(
-#                 f"Object ID: {vehicle.id}, Velocity: {vehicle.velocity}, Direction: {vehicle.direction}, Lane: {vehicle.lane}, Label: {vehicle.name}\n")
-
-def write_to_file():
-    for vehicle in data["in"]:
-        with open('data.txt', 'a') as file:
-            file.write(
-                    f"Object ID: {vehicle.id}, Velocity: {vehicle.velocity}, Direction: {vehicle.direction}, Lane: {vehicle.lane}, Label: {vehicle.name}\n"
-            )
-    for vehicle in data["out"]:
-        with open('data.txt', 'a') as file:
-            file.write(
-                    f"Object ID: {vehicle.id}, Velocity: {vehicle.velocity}, Direction: {vehicle.direction}, Lane: {vehicle.lane}, Label: {vehicle.name}\n"
-            )
\ No newline at end of file
+    def __init__(self, lanes=None, name=""):
+        self.name = name
+        self.lanes = lanes if lanes is not None else []
+        self.data_deque = {}
+        self.frame_deque = {}  # Frame index of every point in data_deque, newest first
+        self.frame_count = 0
+        self.counter = CrossingCounter()
+        self.data = self.counter.events  # Recent unique events per direction
+        self.vehicle_in = self.counter.totals["in"]  # Class -> crossings
+        self.vehicle_out = self.counter.totals["out"]
+        self.sinks = []  # Event writers (e.g. EventLog) that receive every new event as it is recorded
+        self.track_sinks = []  # Writers (e.g. TrackExporter) that receive every frame's tracked boxes
+        self.crossing_sinks = []  # Writers (e.g. OverlayTrackWriter) that receive every crossing, repeated ones too
+        self.lane_index = None  # LaneIndex of the current lane configuration, rebuilt when lanes change
+        self.fps = None  # Frame rate of the stream, for speeds; DEFAULT_FPS when unknown
+        self.calibration = None  # Ground-plane Calibration of the camera; a flat pixel scale without one
+        self.overlay = HudOverlay()  # Cached lane lines and count panels; None draws them directly every frame
+        self.sprites = LabelSpriteCache()  # Cached label badges; None draws them directly every frame
+
+    def reset(self):
+        """
+        Clears tracks and counters left over from a previous video; the lanes are kept.
+        """
+        self.data_deque.clear()
+        self.frame_deque.clear()
+        self.frame_count = 0
+        self.counter.reset()
+
+    def close_sinks(self):
+        """
+        Closes every event, track and crossing sink and detaches them. Each one is closed even if
+        another fails (a failed export must not keep the overlay or the event store from being
+        written); the first error is logged and returned for the caller to raise.
+        """
+        sinks = dict.fromkeys([*self.sinks, *self.track_sinks, *self.crossing_sinks])
+        self.sinks, self.track_sinks, self.crossing_sinks = [], [], []
+        error = None
+        for sink in sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.error("Closing %s failed: %r", type(sink).__name__, e)
+                error = error or e
+        return error
+
+    def add_vehicle(self, id, velocity, direction, obj_name, lane, frame_index=0):
+        vehicle = Vehicle(
+            id=id,
+            velocity=f"{velocity} km/h",
+            name=obj_name,
+            direction=direction,
+            lane=lane,
+            speed=float(velocity),
+            frame=frame_index,
+            recorded_at=time.time()
+        )
+        # Every crossing blinks its lane and counts on the panels; only a track's first one is an event
+        for sink in self.crossing_sinks:
+            sink.write_crossing(vehicle)
+        if self.counter.add(vehicle):
+            for sink in self.sinks:
+                sink.write(vehicle)
+
+    def crossing_speeds(self, track_ids):
+        """
+        Speeds in km/h of the given tracks, fitted over their point histories in one NumPy call.
+        """
+        histories = [self.data_deque[id] for id in track_ids]
+        length = max(len(points) for points in histories)
+        points = np.zeros((len(track_ids), length, 2), dtype=np.float64)
+        frames = np.zeros((len(track_ids), length), dtype=np.float64)
+        counts = np.zeros(len(track_ids), dtype=np.int64)
+        for k, id in enumerate(track_ids):
+            count = len(histories[k])
+            points[k, :count] = histories[k]
+            frames[k, :count] = self.frame_deque[id]
+            counts[k] = count
+        return fit_speeds(points, frames, counts, fps=self.fps, calibration=self.calibration)
+
+    def draw_trail(self, id, img, color):
+        points = self.data_deque[id]
+        for i in range(1, len(points)):
+            # Check if on buffer value is none
+            if points[i - 1] is None or points[i] is None:
+                continue
+            # Generate dynamic thickness of trails
+            thickness = int(np.sqrt(64 / float(i + i)) * 1.5)
+            # Draw trails
+            cv2.line(img, points[i - 1], points[i], color, thickness)
+
+    def show_in(self, img, width):
+        """
+        Displays the number of vehicles entering ("in") based on the vehicle_in dictionary.
+        """
+        for idx, (label, count) in enumerate(self.vehicle_in.items()):
+            draw_panel_title(img, "in", width)
+            draw_panel_row(img, "in", width, idx, label, count)
+
+    def show_out(self, img):
+        """
+        Displays the number of vehicles leaving ("out") based on the vehicle_out dictionary.
+        """
+        for idx, (label, count) in enumerate(self.vehicle_out.items()):
+            draw_panel_title(img, "out", img.shape[1])
+            draw_panel_row(img, "out", img.shape[1], idx, label, count)
+
+    def draw_boxes(self, img, bbox, names, object_id, identities=None, offset=(0, 0), frame_index=None, render=True,
+                   stale=False):
+        """
+        Updates tracks and counts with one frame's boxes and draws the annotation onto img.
+        With render=False only tracking, crossing and counting run and img is returned untouched.
+        Stale boxes (carried forward from an earlier frame, see Detections.stale) are only drawn:
+        they add no trail points, so speeds are not dragged down, and are never tested for a crossing.
+        """
+        lanes = self.lanes
+        data_deque = self.data_deque
+        frame_deque = self.frame_deque
+        self.frame_count += 1
+        frame_index = self.frame_count if frame_index is None else frame_index
+        lane_lines = lanes[:len(lanes) - 1]
+        crossing = lanes[-1]
+
+        # crossing.draw(img)
+        if not render:
+            pass
+        elif self.overlay is not None:
+            self.overlay.draw_lanes(img, lane_lines)
+        else:
+            for lane in lane_lines:
+                lane.draw(img)
+
+        # Remove tracked point from buffer if object is lost
+        active = set(identities) if identities is not None else {0}
+        for key in [key for key in data_deque if key not in active]:
+            data_deque.pop(key)
+            frame_deque.pop(key, None)
+
+        boxes = np.asarray(bbox).reshape(-1, 4).astype(np.int64) + np.array([*offset, *offset], dtype=np.int64)
+        # Center of the bottom edge of every box
+        centers = np.stack([np.trunc((boxes[:, 0] + boxes[:, 2]) / 2).astype(np.int64), boxes[:, 3]], axis=1)
+        ids = [int(identities[i]) if identities is not None else 0 for i in range(len(boxes))]
+        for sink in self.track_sinks:
+            sink.write_frame(frame_index, ids, object_id, boxes, centers, names)
+
+        # Add every center to its buffer, keeping the last two points of each box for the crossing test
+        moved = []
+        for i, id in enumerate(ids):
+            # Create new buffer for new object
+            if id not in data_deque:
+                data_deque[id] = deque(maxlen=64)
+                frame_deque[id] = deque(maxlen=64)
+            if stale:
+                continue
+            data_deque[id].appendleft((int(centers[i, 0]), int(centers[i, 1])))
+            frame_deque[id].appendleft(frame_index)
+            if len(data_deque[id]) >= 2:
+                moved.append((i, data_deque[id][1], frame_deque[id][0] - frame_deque[id][1]))
+
+        # Crossing and lane assignment for all moving boxes at once
+        events = {}
+        if moved:
+            rows = np.array([i for i, _, _ in moved])
+            current = centers[rows]
+            previous = np.array([point for _, point, _ in moved], dtype=np.int64)
+            crossed = intersect_many(current, previous, crossing.start_x, crossing.start_x + crossing.width,
+                                     crossing.y)[:, 0]
+            lane_index = np.full(len(rows), -1, dtype=np.int64)
+            if crossed.any():
+                if self.lane_index is None or self.lane_index.key != LaneIndex.key_for(lane_lines):
+                    self.lane_index = LaneIndex(lane_lines)
+                lane_index[crossed] = self.lane_index.assign(current[crossed], previous[crossed])
+            crossed_rows = np.flatnonzero(crossed)
+            if len(crossed_rows):
+                # Speeds of every crossing track, fitted over their histories at once
+                speeds = self.crossing_speeds([ids[moved[k][0]] for k in crossed_rows])
+                for k, speed in zip(crossed_rows, speeds):
+                    events[moved[k][0]] = (tuple(previous[k]), int(round(speed)), int(lane_index[k]))
+
+        # Without rendering only the crossing boxes need visiting (events is in box order)
+        for i in range(len(ids)) if render else events:
+            id = ids[i]
+            obj_name = names[object_id[i]]  # Object label (e.g., "Car", "Bus")
+
+            if i in events:
+                previous, velocity, lane_number = events[i]
+                center = (int(centers[i, 0]), int(centers[i, 1]))
+                if lane_number >= 0:
+                    lane = lane_lines[lane_number]
+                    logger.debug("%s %s Match True", lane.direction, get_direction(center, previous))
+                    if render:
+                        lane.blink(img)
+                    # Lane numbers start at 1
+                    self.add_vehicle(id, velocity, lane.direction, obj_name, lane_number + 1, frame_index)
+
+            if render:
+                x1, y1, x2, y2 = (int(v) for v in boxes[i])
+                color = compute_color_for_labels(object_id[i])
+                label = '{}{:d}'.format("", id) + ":" + '%s' % (obj_name)
+                UI_box((x1, y1, x2, y2), img, label=label, color=color, line_thickness=2, sprites=self.sprites)
+                self.draw_trail(id, img, color)
+
+        if not render:
+            return img
+        width = img.shape[1]
+        if self.overlay is not None:
+            self.overlay.draw_panels(img, width, self.vehicle_in, self.vehicle_out)
+        else:
+            self.show_in(img, width)
+            self.show_out(img)
+
+        return img